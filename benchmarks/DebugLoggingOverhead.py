@@ -0,0 +1,64 @@
+
+'''
+Cost of the debug calls in createParams when DEBUG logging is off.
+
+Times createParams on a synthetic definitions set, first as shipped, then with
+the module's debug calls replaced by a function that does nothing.  With
+logging off the two should be within noise of each other: debug arguments are
+passed %-style, so nothing is formatted unless a record is emitted.
+
+    python3 benchmarks/DebugLoggingOverhead.py [--params 2000] [--repeat 5]
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import time             #   https://docs.python.org/3/library/time.html
+import argparse         #   https://docs.python.org/3/library/argparse.html
+import logging          #   https://docs.python.org/3/library/logging.html
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from progparams import ProgramParametersDefinitions as PPD
+
+def MakeDefs(n):
+    '''A validated definitions dictionary with n int parameters, each with a long option.'''
+    return PPD.ValidateParamDefs({'Parameters': [
+                { 'paramName': f"p{i}", 'description': f"parameter {i}", 'type': 'int', 'default': str(i)
+                , 'configName': f"p{i}", 'argParserArgs': {'long': f"--p{i}", 'dest': f"p{i}", 'type': 'int'}}
+                for i in range(n)]})
+
+def TimeCreateParams(paramDefs, repeat):
+    '''Best of repeat runs of createParams, in seconds.'''
+    argv = ['bench.py', '--p1', '7']
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        PPD.createParams(paramDefs, argv=argv, leftOverArgs=list(), configPaths=[])
+        t = time.perf_counter() - t
+        best = t if best is None else min(best, t)
+    return best
+
+if __name__ == "__main__":
+    cl = argparse.ArgumentParser(description="Time createParams with its debug calls, and without them.")
+    cl.add_argument('--params', type=int, default=2000, help="Number of synthetic parameters.")
+    cl.add_argument('--repeat', type=int, default=5, help="Runs of each; the best is reported.")
+    clArgs = cl.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.WARNING)        # also silence the "no configuration files" warning
+    paramDefs = MakeDefs(clArgs.params)
+    TimeCreateParams(paramDefs, 1)          # warm up: imports, caches
+    shippedDebug = PPD.debug
+    noOp = lambda *args, **kwargs: None
+    shipped = noDebug = None
+    for _ in range(clArgs.repeat):          # alternate, so drift affects both alike
+        PPD.debug = PPD.logger.debug = shippedDebug
+        t = TimeCreateParams(paramDefs, 1)
+        shipped = t if shipped is None else min(shipped, t)
+        PPD.debug = PPD.logger.debug = noOp
+        t = TimeCreateParams(paramDefs, 1)
+        noDebug = t if noDebug is None else min(noDebug, t)
+    PPD.debug = shippedDebug
+    del PPD.logger.debug                    # back to the Logger method
+    print(f"{clArgs.params} parameters, best of {clArgs.repeat}:")
+    print(f"    debug calls, logging off:   {shipped * 1e3:8.1f} ms")
+    print(f"    debug calls removed:        {noDebug * 1e3:8.1f} ms")
+    print(f"    overhead:                   {(shipped - noDebug) / noDebug * 100:8.1f} %")
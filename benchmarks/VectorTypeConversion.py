@@ -0,0 +1,74 @@
+'''
+Memory and conversion time of FloatVector against the python list path.
+
+A list valued parameter used to be a python list of boxed floats, made by an
+exec'd type expression from an .ini value (or default), or by argparse applying
+type=float to each value of an nargs="+" option.  This converts the same n
+numbers each way, as createParams does, and reports the best time and, from
+tracemalloc, the memory the result holds and the peak while converting.
+
+    python3 benchmarks/VectorTypeConversion.py [--numbers 50000] [--repeat 5]
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import gc               #   https://docs.python.org/3/library/gc.html
+import time             #   https://docs.python.org/3/library/time.html
+import random           #   https://docs.python.org/3/library/random.html
+import argparse         #   https://docs.python.org/3/library/argparse.html
+import tracemalloc      #   https://docs.python.org/3/library/tracemalloc.html
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from progparams import ProgramParametersDefinitions as PPD
+from progparams.VectorTypes import FloatVector
+
+#  What a definitions file gave as the type of a list parameter before vector types.
+listType = "lambda s: [float(x) for x in s.replace(',', ' ').split()]"
+
+def FromIni(typeExpr, value):
+    '''Convert an .ini value as createParams does: exec'd in the definitions module's namespace.'''
+    created = dict()
+    exec(f"p = ({typeExpr})({value!r})", vars(PPD), created)
+    return created['p']
+
+def FromOption(tokens, perValueType, bulkType=None):
+    '''Convert the values of an nargs="+" option as createParams does.'''
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--p', nargs='+', type=perValueType)
+    value = parser.parse_args(['--p'] + tokens).p
+    return value if bulkType is None else bulkType(value)
+
+def Measure(convert, repeat):
+    '''(best seconds, bytes held by the result, peak bytes while converting) of convert().'''
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        convert()
+        t = time.perf_counter() - t
+        best = t if best is None else min(best, t)
+    gc.collect()
+    tracemalloc.start()
+    result = convert()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, held, peak
+
+if __name__ == "__main__":
+    cl = argparse.ArgumentParser(description="Compare FloatVector with python lists of floats.")
+    cl.add_argument('--numbers', type=int, default=50000, help="Numbers in the vector.")
+    cl.add_argument('--repeat', type=int, default=5, help="Timed runs of each; the best is reported.")
+    clArgs = cl.parse_args()
+    rng = random.Random(1)
+    tokens = [repr(rng.uniform(-1e3, 1e3)) for _ in range(clArgs.numbers)]
+    iniValue = ", ".join(tokens)
+    cases = ( (".ini value, exec'd list type", lambda: FromIni(listType, iniValue))
+            , (".ini value, FloatVector", lambda: FromIni("FloatVector", iniValue))
+            , ("nargs option, type=float", lambda: FromOption(tokens, float))
+            , ("nargs option, FloatVector", lambda: FromOption(tokens, FloatVector.unchecked, FloatVector))
+            )
+    print(f"{clArgs.numbers} numbers, best of {clArgs.repeat}:")
+    print(f"    {'':32} {'time':>10} {'held':>10} {'peak':>10}")
+    for (name, convert) in cases:
+        best, held, peak = Measure(convert, clArgs.repeat)
+        print(f"    {name:32} {best * 1e3:7.1f} ms {held / 1024:7.0f} KB {peak / 1024:7.0f} KB")
@@ -0,0 +1,216 @@
+
+'''
+Generate static shell completion for a program that uses MakeParams.
+
+Completing by running the program means starting python, importing progparams
+and running GetParams, ValidateParamDefs and createParams on every key press.
+Instead, generate once from the parameter definitions file (with the
+BoilerPlateArgs, -h/--help, and the options of all included parameter groups):
+    <prog>.completion.json      the completion index
+    <prog>.bash                 bash completion script (source it)
+    _<prog>.zsh                 zsh completion script (put it on $fpath, or source it)
+The scripts hold the option names and choices themselves, so completing
+costs no interpreter start.  Each time they are used they compare the time
+stamps of the definitions file and the parameter module files it includes with
+the index, and if any of them is newer regenerate everything in the background
+for the next key press.
+
+From the command line:
+    python3 -m progparams.Completion <definitions file> [--prog <program name>] [--out <directory>]
+From a program:
+    from progparams.Completion import RefreshCompletion
+    RefreshCompletion(params['paramFile'], 'myProg.py', outDir)
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import ast              #   https://docs.python.org/3/library/ast.html
+import json             #   https://docs.python.org/3/library/json.html
+import re               #   https://docs.python.org/3/library/re.html
+import shlex            #   https://docs.python.org/3/library/shlex.html
+import argparse         #   https://docs.python.org/3/library/argparse.html
+import logging          #   https://docs.python.org/3/library/logging.html
+
+from progparams.ProgramParametersDefinitions import (BoilerPlateArgs, ValidateParamDefs
+                                                    , LoadDefsFile, LoadParamModule)
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+info = logger.info
+warning = logger.warning
+
+#  argparse actions that do not consume a value from the command line.
+_actionsWithNoValue = ("store_const", "store_true", "store_false", "append_const", "count")
+#  argparse actions that may be given more than once.
+_repeatableActions = ("append", "append_const", "count", "extend")
+
+def _optionEntry(a, description=None):
+    '''Make a completion index entry from an argParserArgs (or BoilerPlateArgs) dict.'''
+    action = a.get('action') or 'store'
+    choices = None
+    if a.get('choices') is not None:
+        try:
+            choices = [str(c) for c in ast.literal_eval(a['choices'])]
+        except (ValueError, SyntaxError, TypeError):
+            warning(f"Choices {a['choices']!r} are not a python literal; not completed.")
+    return { 'options': [o for o in (a.get('short'), a.get('long')) if o is not None]
+            , 'takesValue': (action not in _actionsWithNoValue) and (a.get('nargs') != '0')
+            , 'repeatable': action in _repeatableActions
+            , 'choices': choices
+            , 'metavar': a.get('metavar') or a.get('dest') or ''
+            , 'help': a.get('help') or description or ''
+            }
+
+def MakeCompletionIndex(paramDefs, prog, source=None, baseDir=None):
+    '''
+    Return the completion index (a JSON-able dict) for validated paramDefs.
+    Included parameter modules are found relative to baseDir; their paths are
+    kept in the index, as the completion is stale when any of them changes.
+    '''
+    entries = [{'options': ['-h', '--help'], 'takesValue': False, 'repeatable': False
+                , 'choices': None, 'metavar': '', 'help': 'show this help message and exit'}]
+    entries.extend(_optionEntry(a) for a in BoilerPlateArgs)
+    parameters = list(paramDefs.get('Parameters') or [])
+    includes = list()
+    for inc in paramDefs.get('Includes') or []:
+        includes.append(os.path.realpath(os.path.join(baseDir or '', os.path.expanduser(inc['path']))))
+        moduleDefs = LoadParamModule(includes[-1])
+        if moduleDefs is not None: parameters.extend(moduleDefs['Parameters'])
+    for p in parameters:
+        a = p.get('argParserArgs')
+        if (a is None) or ((a.get('short') is None) and (a.get('long') is None)): continue
+        entries.append(_optionEntry(a, p.get('description')))
+    return {'prog': prog, 'source': source, 'includes': includes, 'options': entries}
+
+def _bashFunctionName(prog):
+    return '_' + re.sub(r'\W', '_', prog) + '_complete'
+
+def MakeBashScript(index, indexPath=None):
+    '''Return a bash completion script for the completion index.'''
+    prog = index['prog']
+    words = ' '.join(o for e in index['options'] for o in e['options'])
+    cases = list()
+    for e in index['options']:
+        if not e['takesValue']: continue
+        if e['choices']:
+            reply = f'COMPREPLY=( $(compgen -W {shlex.quote(" ".join(e["choices"]))} -- "$cur") )'
+        else:
+            reply = 'COMPREPLY=( $(compgen -f -- "$cur") )'
+        cases.append(f"        {'|'.join(e['options'])}) {reply}; return;;")
+    stale = ''
+    if (index.get('source') is not None) and (indexPath is not None):
+        outDir = os.path.dirname(indexPath)
+        regenerate = ' '.join(shlex.quote(x) for x in (sys.executable, '-m', 'progparams.Completion'
+                                                        , index['source'], '--prog', prog, '--out', outDir))
+        newer = ' || '.join(f"{shlex.quote(s)} -nt {shlex.quote(indexPath)}"
+                            for s in [index['source']] + list(index.get('includes') or ()))
+        stale = (f"    if [[ {newer} ]]; then\n"
+                 f"        ( {regenerate} >/dev/null 2>&1 & )\n"
+                 f"    fi\n")
+    nl = '\n'
+    return f'''# bash completion for {prog}; generated by progparams.Completion from {index.get('source')}
+{_bashFunctionName(prog)}() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}" prev="${{COMP_WORDS[COMP_CWORD-1]}}"
+{stale}    case "$prev" in
+{nl.join(cases)}
+    esac
+    if [[ "$cur" == -* ]]; then
+        COMPREPLY=( $(compgen -W {shlex.quote(words)} -- "$cur") )
+    else
+        COMPREPLY=( $(compgen -f -- "$cur") )
+    fi
+}}
+complete -F {_bashFunctionName(prog)} {shlex.quote(prog)}
+'''
+
+def _zshEscape(text):
+    '''Escape text for the inside of a single quoted _arguments spec.'''
+    return re.sub(r"([\[\]:\\])", r"\\\1", text.replace("\n", " ")).replace("'", "'\\''")
+
+def MakeZshScript(index):
+    '''Return a zsh completion script (for $fpath or to source) for the completion index.'''
+    prog = index['prog']
+    specs = list()
+    for e in index['options']:
+        opts = e['options']
+        helpText = _zshEscape(e['help'])
+        if e['takesValue']:
+            action = f"({' '.join(_zshEscape(c) for c in e['choices'])})" if e['choices'] else '_files'
+            value = f":{_zshEscape(e['metavar'])}:{action}"
+        else:
+            value = ''
+        repeat = '*' if e['repeatable'] else ''
+        exclusive = '' if e['repeatable'] or (len(opts) < 2) else f"({' '.join(opts)})"
+        if len(opts) > 1:
+            specs.append(f"'{exclusive}{repeat}'{{{','.join(opts)}}}'[{helpText}]{value}'")
+        else:
+            specs.append(f"'{repeat}{opts[0]}[{helpText}]{value}'")
+    body = ' \\\n    '.join(specs)
+    return f'''#compdef {prog}
+# zsh completion for {prog}; generated by progparams.Completion from {index.get('source')}
+_arguments -s \\
+    {body} \\
+    '*:file:_files'
+'''
+
+def WriteCompletion(paramFile, prog=None, outDir=None):
+    '''
+    Generate the completion index and scripts for the definitions in paramFile.
+    prog defaults to the definitions file name less "Params.<ext>" plus ".py";
+    outDir defaults to the directory of paramFile.
+    Returns the list of files written, or None if the definitions are not valid.
+    '''
+    paramFile = os.path.realpath(paramFile)
+    baseDir = os.path.dirname(paramFile)
+    if prog is None:
+        prog = re.sub(r'Params$', '', os.path.splitext(os.path.basename(paramFile))[0]) + '.py'
+    if outDir is None: outDir = baseDir
+    paramDefs = ValidateParamDefs(LoadDefsFile(paramFile))
+    if paramDefs is None:
+        warning(f"No valid parameter definitions in {paramFile}; completion not generated.")
+        return None
+    os.makedirs(outDir, exist_ok=True)
+    index = MakeCompletionIndex(paramDefs, prog, source=paramFile, baseDir=baseDir)
+    indexPath = os.path.join(outDir, f"{prog}.completion.json")
+    outputs = ( (os.path.join(outDir, f"{prog}.bash"), MakeBashScript(index, indexPath))
+              , (os.path.join(outDir, f"_{prog}.zsh"), MakeZshScript(index))
+              , (indexPath, json.dumps(index, indent=2)) )    # index last; its time stamp marks the set as current.
+    for (path, text) in outputs:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(text)
+        os.replace(tmp, path)       # a completing shell never sees a partly written file.
+    info(f"Wrote completion for {prog} to {outDir}")
+    return [path for (path, _) in outputs]
+
+def RefreshCompletion(paramFile, prog=None, outDir=None):
+    '''
+    WriteCompletion, but only if the completion index is missing or older than
+    paramFile or one of the parameter module files it includes.
+    '''
+    paramFile = os.path.realpath(paramFile)
+    if prog is None:
+        prog = re.sub(r'Params$', '', os.path.splitext(os.path.basename(paramFile))[0]) + '.py'
+    if outDir is None: outDir = os.path.dirname(paramFile)
+    indexPath = os.path.join(outDir, f"{prog}.completion.json")
+    try:
+        indexStamp = os.stat(indexPath).st_mtime_ns
+        with open(indexPath) as f:
+            includes = json.load(f)['includes']
+        #  As bash's -nt: an included file that is not there is not newer.
+        if all(indexStamp >= os.stat(s).st_mtime_ns for s in [paramFile] + [i for i in includes if os.path.exists(i)]):
+            return None
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        pass        # no index, or one from before includes were recorded.
+    return WriteCompletion(paramFile, prog, outDir)
+
+if __name__ == "__main__":
+    cl = argparse.ArgumentParser(description="Generate bash and zsh completion for a program's parameter definitions file.")
+    cl.add_argument('paramFile', help="The .toml, .jsonc or .json parameter definitions file.")
+    cl.add_argument('--prog', help="The program name to complete; default from the definitions file name.")
+    cl.add_argument('--out', help="Directory for the generated files; default the definitions file directory.")
+    cl.add_argument('--force', action='store_true', help="Regenerate even if the definitions have not changed.")
+    clArgs = cl.parse_args()
+    written = (WriteCompletion if clArgs.force else RefreshCompletion)(clArgs.paramFile, clArgs.prog, clArgs.out)
+    for w in written or ():
+        print(w)
@@ -0,0 +1,236 @@
+
+'''
+Configuration source backends for GetConfig.
+
+GetConfig reads the [DEFAULT] section and its section cascade ([LOCATION],
+[HOST], [program], ...) from each of its configPaths, later paths overriding
+earlier ones.  Each path is read by the backend registered for its file
+extension; anything not registered is read as an .ini file.
+
+    .ini (and default)          IniFileSource       (FilteredIni.ReadIniSections)
+    .sqlite, .sqlite3, .db      SqliteConfigSource
+
+A backend loads the wanted sections, plus the sections they reference through
+${section:option} interpolation, into GetConfig's configparser, so the section
+cascade and interpolation work the same whatever the source.
+
+SqliteConfigSource keeps options in a table indexed by (section, option), so
+only the cascade sections are ever read, however many hosts the store holds.
+Each database has one connection per process, and rows read are kept for a
+time to live (default 60 seconds) or until the store changes.
+
+Create or update a store from existing .ini files with:
+    python3 -m progparams.ConfigSources <store.sqlite> <file.ini> [<file.ini> ...]
+or ImportIniToSqlite(dbPath, iniPaths).
+
+Other backends: subclass ConfigSource and RegisterConfigSource('.ext', TheClass).
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import abc              #   https://docs.python.org/3/library/abc.html
+import time             #   https://docs.python.org/3/library/time.html
+import sqlite3          #   https://docs.python.org/3/library/sqlite3.html
+import threading        #   https://docs.python.org/3/library/threading.html
+import configparser     #   https://docs.python.org/3/library/configparser.html
+import argparse         #   https://docs.python.org/3/library/argparse.html
+import logging          #   https://docs.python.org/3/library/logging.html
+from progparams.FilteredIni import ReadIniSections, _sectionReference
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+info = logger.info
+warning = logger.warning
+
+class ConfigSource(abc.ABC):
+    '''
+    A backend GetConfig reads configuration sections from.
+
+    Parameters:
+        paths           required: the file (or list of files, for backends that
+                        read several together) this source reads.
+    '''
+    def __init__(self, paths):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+
+    @abc.abstractmethod
+    def load(self, config: configparser.RawConfigParser, sections) -> list:
+        '''
+        Load [DEFAULT], the given sections, and the sections they reference
+        for interpolation into config.  Return the list of paths read.
+        '''
+
+    @staticmethod
+    @abc.abstractmethod
+    def stamp(path):
+        '''Something that changes whenever what path holds changes (e.g. modification time and size).'''
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.paths!r})"
+
+class IniFileSource(ConfigSource):
+    '''.ini files; only the wanted sections are kept (see FilteredIni).'''
+    @staticmethod
+    def stamp(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self, config, sections):
+        return ReadIniSections(config, self.paths, sections)
+
+##########################  SQLite  ##############################
+_connections = dict()           # real path -> (inode, sqlite3 connection); one per process
+_rows = dict()                  # (real path, section) -> (expires, stamp, {option: value})
+_sqliteLock = threading.Lock()  # sqlite3 wants use of a shared connection serialized.
+
+_createTable = '''CREATE TABLE IF NOT EXISTS options
+    ( section TEXT NOT NULL
+    , option TEXT NOT NULL
+    , value TEXT
+    , PRIMARY KEY (section, option)
+    ) WITHOUT ROWID'''
+
+def _sqliteStamp(dbPath):
+    '''What changes when the store is written: the file, and its write ahead log if any.'''
+    st = os.stat(dbPath)
+    try:
+        wal = os.stat(dbPath + '-wal')
+        walStamp = (wal.st_mtime_ns, wal.st_size)
+    except OSError:
+        walStamp = None
+    return (st.st_ino, st.st_mtime_ns, st.st_size, walStamp)
+
+def _connection(dbPath, inode):
+    '''The process' connection to dbPath, (re)opened if there is none or the file was replaced.
+    Call with _sqliteLock held.'''
+    known = _connections.get(dbPath)
+    if (known is not None) and (known[0] == inode):
+        return known[1]
+    if known is not None: known[1].close()
+    #  Read only; GetConfig never writes the store.
+    conn = sqlite3.connect(f"file:{dbPath}?mode=ro", uri=True, check_same_thread=False)
+    _connections[dbPath] = (inode, conn)
+    return conn
+
+class SqliteConfigSource(ConfigSource):
+    '''
+    SQLite configuration stores with table options(section, option, value).
+    Rows read are shared by all SqliteConfigSources in the process.
+
+    Keyword parameters:
+        ttl             optional: seconds to keep rows read; default SqliteConfigSource.ttl (60).
+    '''
+    ttl = 60.0
+
+    def __init__(self, paths, ttl=None):
+        super().__init__(paths)
+        if ttl is not None: self.ttl = ttl
+
+    stamp = staticmethod(_sqliteStamp)
+
+    def _section(self, dbPath, section, stamp):
+        '''{option: value} of section in dbPath (empty if it's not there).'''
+        now = time.monotonic()
+        cached = _rows.get((dbPath, section))
+        if (cached is not None) and (cached[0] > now) and (cached[1] == stamp):
+            return cached[2]
+        with _sqliteLock:
+            conn = _connection(dbPath, stamp[0])
+            options = dict(conn.execute("SELECT option, value FROM options WHERE section = ?", (section,)))
+            _rows[(dbPath, section)] = (now + self.ttl, stamp, options)
+        return options
+
+    def load(self, config, sections):
+        used = list()
+        for path in self.paths:
+            dbPath = os.path.realpath(path)
+            wanted = [config.default_section] + [s for s in sections if s != config.default_section]
+            loaded = dict()
+            try:
+                stamp = _sqliteStamp(dbPath)
+                while wanted:
+                    section = wanted.pop(0)
+                    if section in loaded: continue
+                    loaded[section] = options = self._section(dbPath, section, stamp)
+                    for value in options.values():          # follow ${section:option} references
+                        if value and ('${' in value):
+                            wanted.extend(s for s in _sectionReference.findall(value) if s not in loaded)
+            except (OSError, sqlite3.Error) as e:
+                warning(f"Configuration store {path} not read: {e}")
+                continue
+            #  As from an .ini file: only sections that are in the store.
+            config.read_dict({s: o for (s, o) in loaded.items() if o}, source=path)
+            used.append(path)
+            debug("Read sections %s from %s", [s for s in loaded if loaded[s]], path)
+        return used
+
+def ImportIniToSqlite(dbPath, iniPaths, replace=False):
+    '''
+    Copy every section and option of iniPaths (uninterpolated) into the SQLite store
+    dbPath, creating it if need be.  Options already in the store are overwritten;
+    with replace=True, the store is emptied first.  Returns the number of options written.
+    '''
+    if isinstance(iniPaths, str): iniPaths = (iniPaths,)
+    #  No default section while importing, so [DEFAULT] is stored as it is and is
+    #  not copied into every other section.  Values stay raw; they are interpolated when read.
+    ini = configparser.RawConfigParser(default_section='\0')
+    filesRead = ini.read(iniPaths)
+    rows = [(section, o, v) for section in ini.sections() for (o, v) in ini.items(section, raw=True)]
+    conn = sqlite3.connect(dbPath)
+    try:
+        with conn:                  # one transaction
+            conn.execute(_createTable)
+            if replace: conn.execute("DELETE FROM options")
+            conn.executemany("INSERT OR REPLACE INTO options (section, option, value) VALUES (?, ?, ?)", rows)
+    finally:
+        conn.close()
+    info(f"Imported {len(rows)} options from {filesRead} into {dbPath}")
+    return len(rows)
+
+##########################  Backend registry  ##############################
+ConfigSourceTypes = { '.ini': IniFileSource
+                    , '.sqlite': SqliteConfigSource
+                    , '.sqlite3': SqliteConfigSource
+                    , '.db': SqliteConfigSource
+                    }
+
+def RegisterConfigSource(extension: str, sourceClass):
+    '''Read configPaths ending with extension (e.g. ".yaml") with sourceClass, a ConfigSource subclass.'''
+    ConfigSourceTypes[extension.lower()] = sourceClass
+
+def ConfigSourcesFor(paths) -> list:
+    '''
+    The ConfigSources that read paths, in order.  Consecutive paths of the same kind
+    share one source (so .ini files can reference each other's sections).
+    '''
+    sources = list()
+    for path in paths:
+        sourceClass = ConfigSourceTypes.get(os.path.splitext(path)[1].lower(), IniFileSource)
+        if sources and (type(sources[-1]) is sourceClass):
+            sources[-1].paths.append(path)
+        else:
+            sources.append(sourceClass(path))
+    return sources
+
+def SourceStamp(path):
+    '''The stamp of path from the backend that reads it, or None if it can't be read.'''
+    try:
+        return ConfigSourceTypes.get(os.path.splitext(path)[1].lower(), IniFileSource).stamp(path)
+    except OSError:
+        return None
+
+def LoadConfigSources(config, paths, sections) -> list:
+    '''Load sections from every path in paths into config, later paths overriding earlier ones.
+    Returns the list of paths read.'''
+    used = list()
+    for source in ConfigSourcesFor(paths):
+        used.extend(source.load(config, sections))
+    return used
+
+if __name__ == "__main__":
+    cl = argparse.ArgumentParser(description="Import .ini files into an SQLite configuration store.")
+    cl.add_argument('store', help="The SQLite file to create or update.")
+    cl.add_argument('ini', nargs='+', help=".ini files to import; later files override earlier ones.")
+    cl.add_argument('--replace', action='store_true', help="Empty the store first.")
+    clArgs = cl.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    ImportIniToSqlite(clArgs.store, clArgs.ini, replace=clArgs.replace)
@@ -0,0 +1,380 @@
+
+'''
+An argument parser for programs with very many parameters.
+
+argparse.ArgumentParser does a fair amount of work per option: add_argument
+builds a help formatter (which asks for the terminal size) for every option,
+and every parse sets each option's default one attribute at a time and, for each
+command line option string that is not an exact match, compares it with every
+option for abbreviations.  With thousands of parameters that adds up.
+
+FastArgumentParser takes the same add_argument calls createParams makes, and
+parses by exact dictionary lookup of option strings, following argparse's
+parsing rules (option values, "--opt=value", "-xVALUE", "-vvv", "--",
+positionals) for the actions in validArgParserActions:
+    store, store_const, store_true, store_false, append, append_const, count, extend
+It gives the same namespace and left over arguments as argparse.
+
+Anything it does not do itself is left to an argparse.ArgumentParser with the
+same arguments, built only when it is needed:
+    help and usage text (-h/--help, format_help, print_usage, ...), so it is
+        argparse's own;
+    command lines argparse would reject (unknown choice, bad value, missing
+        required argument, ...), which are re-parsed by argparse so the error
+        message and exit status are argparse's;
+    command lines with abbreviated options (--verb for --verbosity), found
+        by a binary search of the sorted option strings.
+
+To use it, in the parameter definitions file:
+    ArgParser = "fast"
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import re               #   https://docs.python.org/3/library/re.html
+import copy             #   https://docs.python.org/3/library/copy.html
+import bisect           #   https://docs.python.org/3/library/bisect.html
+import argparse         #   https://docs.python.org/3/library/argparse.html
+import logging          #   https://docs.python.org/3/library/logging.html
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+
+_negativeNumber = re.compile(r'^-\d+$|^-\d*\.\d+$')     # as argparse
+
+#  Keyword arguments each action accepts (besides option strings and dest), as argparse's Action classes.
+_actionKeyWords = { 'store':        ('nargs', 'const', 'default', 'type', 'choices', 'required', 'help', 'metavar')
+                  , 'store_const':  ('const', 'default', 'required', 'help', 'metavar')
+                  , 'store_true':   ('default', 'required', 'help')
+                  , 'store_false':  ('default', 'required', 'help')
+                  , 'append':       ('nargs', 'const', 'default', 'type', 'choices', 'required', 'help', 'metavar')
+                  , 'append_const': ('const', 'default', 'required', 'help', 'metavar')
+                  , 'count':        ('default', 'required', 'help')
+                  , 'extend':       ('nargs', 'const', 'default', 'type', 'choices', 'required', 'help', 'metavar')
+                  , 'help':         ('default', 'help')
+                  }
+
+class _Fallback(Exception):
+    '''The command line needs argparse itself (an error, or an abbreviated option).'''
+
+def _nargsPattern(nargs, optional):
+    '''argparse's pattern of "A" (argument) and "-" ("--") strings an action consumes.'''
+    if nargs is None:               pattern = '(-*A-*)'
+    elif nargs == argparse.OPTIONAL:      pattern = '(-*A?-*)'
+    elif nargs == argparse.ZERO_OR_MORE:  pattern = '(-*[A-]*)'
+    elif nargs == argparse.ONE_OR_MORE:   pattern = '(-*A[A-]*)'
+    elif nargs == 0:                pattern = '()'
+    else:                           pattern = '(-*%s-*)' % '-*'.join('A' * nargs)
+    if optional:                    # options don't consume "--"
+        pattern = pattern.replace('-*', '').replace('-', '')
+    return pattern
+
+def _copyItems(items):
+    if items is None: return []
+    if type(items) is list: return items[:]
+    return copy.copy(items)
+
+class _Action:
+    '''What FastArgumentParser keeps of one add_argument call.'''
+    __slots__ = ('optionStrings', 'dest', 'action', 'nargs', 'const', 'default', 'type'
+                , 'choices', 'required', 'pattern')
+
+    def __init__(self, optionStrings, dest, action='store', nargs=None, const=None, default=None
+                , type=None, choices=None, required=False, help=None, metavar=None):
+        if action in ('store_true', 'store_false'):
+            const = action == 'store_true'
+            if default is None: default = not const
+        if action in ('store_const', 'store_true', 'store_false', 'append_const', 'count', 'help'):
+            nargs = 0
+        elif nargs == 0:
+            raise ValueError('nargs for store actions must be != 0; if you have nothing to store, actions such as store true or store const may be more appropriate')
+        elif (nargs is not None) and (nargs not in (argparse.OPTIONAL, argparse.ZERO_OR_MORE, argparse.ONE_OR_MORE)) \
+                and not (isinstance(nargs, int) and (nargs > 0)):
+            raise ValueError(f"invalid nargs value: {nargs!r}")
+        if (type is not None) and not callable(type):
+            raise ValueError(f"{type!r} is not callable")
+        self.optionStrings = optionStrings
+        self.dest, self.action, self.nargs, self.const = dest, action, nargs, const
+        self.default, self.type, self.choices, self.required = default, type, choices, required
+        self.pattern = re.compile(_nargsPattern(nargs, bool(optionStrings)))
+
+    def convert(self, value):
+        if self.type is not None:
+            try:
+                value = self.type(value)
+            except (argparse.ArgumentTypeError, TypeError, ValueError):
+                raise _Fallback()
+        if (self.choices is not None) and (value not in self.choices):
+            raise _Fallback()
+        return value
+
+    def values(self, strings):
+        '''argparse's _get_values.'''
+        if '--' in strings:
+            strings = list(strings); strings.remove('--')
+        if (not strings) and (self.nargs == argparse.OPTIONAL):
+            value = self.const if self.optionStrings else self.default
+            if isinstance(value, str): value = self.convert(value)
+            return value
+        if (not strings) and (self.nargs == argparse.ZERO_OR_MORE) and (not self.optionStrings):
+            value = self.default if self.default is not None else strings
+            if (self.choices is not None) and (value not in self.choices): raise _Fallback()
+            return value
+        if (len(strings) == 1) and (self.nargs in (None, argparse.OPTIONAL)):
+            return self.convert(strings[0])
+        return [self.convert(s) for s in strings]
+
+    def take(self, namespace, values):
+        '''The argparse action.'''
+        action, dest = self.action, self.dest
+        if action == 'store':
+            setattr(namespace, dest, values)
+        elif action in ('store_const', 'store_true', 'store_false'):
+            setattr(namespace, dest, self.const)
+        elif action == 'append':
+            items = _copyItems(getattr(namespace, dest, None)); items.append(values)
+            setattr(namespace, dest, items)
+        elif action == 'append_const':
+            items = _copyItems(getattr(namespace, dest, None)); items.append(self.const)
+            setattr(namespace, dest, items)
+        elif action == 'count':
+            count = getattr(namespace, dest, None)
+            setattr(namespace, dest, 1 if count is None else count + 1)
+        elif action == 'extend':
+            items = _copyItems(getattr(namespace, dest, None)); items.extend(values)
+            setattr(namespace, dest, items)
+        else:                   # 'help'
+            raise _Fallback()
+
+class FastArgumentParser:
+    '''
+    Takes argparse.ArgumentParser's constructor arguments; the argparse parser
+    for help and errors is built with them.
+    '''
+    def __init__(self, prog=None, usage=None, description=None, epilog=None, add_help=True, **kwargs):
+        if prog is None: prog = os.path.basename(sys.argv[0])
+        self.prog = prog
+        self._parserArgs = dict(prog=prog, usage=usage, description=description, epilog=epilog, add_help=add_help, **kwargs)
+        if self._parserArgs.get('prefix_chars', '-') != '-':
+            raise ValueError("FastArgumentParser only handles the '-' prefix character.")
+        self._calls = list()                # (how, args, kwargs) to replay on the argparse parser
+        self._argParser = None
+        self._optionActions = dict()        # option string -> _Action
+        self._sortedOptions = list()        # option strings, sorted, for spotting abbreviations
+        self._positionals = list()
+        self._defaults = dict()             # dest -> default, as argparse sets them into a new namespace
+        self._checkAfter = list()           # actions that are required or have a str default to convert
+        self._negativeNumberOptions = False
+        if add_help:
+            self._addAction(['-h', '--help'], 'help', {'action': 'help', 'default': argparse.SUPPRESS})
+
+    ##########  Building  ##########
+    def register(self, registryName, value, obj):
+        self._calls.append(('register', (registryName, value, obj), {}))
+        self._argParser = None
+
+    def add_argument(self, *args, **kwargs):
+        self._calls.append(('add_argument', args, dict(kwargs)))
+        self._argParser = None
+        if (not args) or (len(args) == 1 and args[0][:1] != '-'):
+            if not args: raise TypeError("add_argument() missing option strings or dest")
+            if 'dest' in kwargs: raise ValueError('dest supplied twice for positional argument')
+            dest = args[0]
+            if kwargs.get('nargs') not in (argparse.OPTIONAL, argparse.ZERO_OR_MORE) \
+                    or (kwargs.get('nargs') == argparse.ZERO_OR_MORE and 'default' not in kwargs):
+                kwargs['required'] = True
+            optionStrings = []
+        else:
+            for o in args:
+                if o[:1] != '-':
+                    raise ValueError(f"invalid option string {o!r}: must start with a character '-'")
+            optionStrings = list(args)
+            dest = kwargs.pop('dest', None)
+            if dest is None:
+                longs = [o for o in args if len(o) > 1 and o[1] == '-']
+                dest = (longs or args)[0].lstrip('-').replace('-', '_')
+        action = kwargs.pop('action', None) or 'store'
+        self._addAction(optionStrings, dest, dict(kwargs, action=action))
+
+    def _addAction(self, optionStrings, dest, kwargs):
+        action = kwargs.pop('action')
+        if action not in _actionKeyWords:
+            raise ValueError(f"unknown action {action!r}")
+        for k in kwargs:
+            if k not in _actionKeyWords[action]:
+                raise TypeError(f"{action} action got an unexpected keyword argument '{k}'")
+        kwargs.pop('help', None); kwargs.pop('metavar', None)
+        if action == 'help': dest = argparse.SUPPRESS
+        a = _Action(optionStrings, dest, action, **kwargs)
+        for o in optionStrings:
+            if o in self._optionActions:
+                raise argparse.ArgumentError(None, f"argument {'/'.join(optionStrings)}: conflicting option string: {o}")
+        for o in optionStrings:
+            self._optionActions[o] = a
+            bisect.insort(self._sortedOptions, o)
+            if _negativeNumber.match(o): self._negativeNumberOptions = True
+        if not optionStrings: self._positionals.append(a)
+        if (dest != argparse.SUPPRESS) and (a.default != argparse.SUPPRESS):
+            self._defaults.setdefault(dest, a.default)
+        if a.required or (isinstance(a.default, str) and a.type is not None):
+            self._checkAfter.append(a)
+
+    def _argparser(self) -> argparse.ArgumentParser:
+        '''The equivalent argparse parser, for help and errors.'''
+        if self._argParser is None:
+            p = argparse.ArgumentParser(**self._parserArgs)
+            for (how, args, kwargs) in self._calls:
+                getattr(p, how)(*args, **kwargs)
+            self._argParser = p
+        return self._argParser
+
+    ##########  Help and errors: argparse's own  ##########
+    def format_usage(self): return self._argparser().format_usage()
+    def format_help(self): return self._argparser().format_help()
+    def print_usage(self, file=None): self._argparser().print_usage(file)
+    def print_help(self, file=None): self._argparser().print_help(file)
+    def exit(self, status=0, message=None): self._argparser().exit(status, message)
+    def error(self, message): self._argparser().error(message)
+
+    ##########  Parsing  ##########
+    def _parseOptional(self, s):
+        '''As argparse's _parse_optional: None for a positional, else (action or None, option string, explicit arg).'''
+        if (not s) or (s[0] != '-'): return None
+        action = self._optionActions.get(s)
+        if action is not None: return action, s, None
+        if len(s) == 1: return None
+        if '=' in s:
+            optionString, explicitArg = s.split('=', 1)
+            action = self._optionActions.get(optionString)
+            if action is not None: return action, optionString, explicitArg
+        #  argparse would look for abbreviations here; leave those to it.
+        prefix = s.split('=', 1)[0] if s[1] == '-' else s
+        i = bisect.bisect_left(self._sortedOptions, prefix)
+        if (i < len(self._sortedOptions)) and self._sortedOptions[i].startswith(prefix):
+            raise _Fallback()
+        if s[1] != '-':                 # -xVALUE or -xyz
+            action = self._optionActions.get(s[:2])
+            if action is not None: return action, s[:2], s[2:]
+        if _negativeNumber.match(s) and not self._negativeNumberOptions: return None
+        if ' ' in s: return None
+        return None, s, None
+
+    def parse_known_args(self, args=None, namespace=None):
+        if args is None: args = sys.argv[1:]
+        else: args = list(args)
+        try:
+            return self._parseKnownArgs(args, namespace)
+        except (_Fallback, argparse.ArgumentError):
+            debug("Command line handed to argparse: %r", args)
+            return self._argparser().parse_known_args(args, namespace)
+
+    def parse_args(self, args=None, namespace=None):
+        namespace, extras = self.parse_known_args(args, namespace)
+        if extras:
+            self.error(f"unrecognized arguments: {' '.join(extras)}")
+        return namespace
+
+    def _parseKnownArgs(self, args, namespace):
+        if namespace is None:
+            namespace = argparse.Namespace()
+            namespace.__dict__.update(self._defaults)
+        else:
+            for (dest, default) in self._defaults.items():
+                if not hasattr(namespace, dest): setattr(namespace, dest, default)
+
+        #  Classify the strings as argparse does: "O" option, "A" argument, "-" for "--".
+        optionIndices = dict()
+        patternParts = list()
+        for (i, s) in enumerate(args):
+            if s == '--':
+                patternParts.append('-')
+                patternParts.extend('A' * (len(args) - i - 1))
+                break
+            option = self._parseOptional(s)
+            if option is None:
+                patternParts.append('A')
+            else:
+                optionIndices[i] = option
+                patternParts.append('O')
+        pattern = ''.join(patternParts)
+
+        seen = set()
+        extras = list()
+        def takeAction(action, strings):
+            seen.add(id(action))
+            values = action.values(strings)
+            if values is not argparse.SUPPRESS:
+                action.take(namespace, values)
+
+        def consumeOptional(start):
+            (action, optionString, explicitArg) = optionIndices[start]
+            actionTuples = list()
+            while True:
+                if action is None:
+                    extras.append(args[start])
+                    return start + 1
+                if explicitArg is not None:
+                    m = action.pattern.match('A')
+                    argCount = None if m is None else len(m.group(1))
+                    if (argCount == 0) and (optionString[1] != '-') and (explicitArg != ''):
+                        actionTuples.append((action, []))
+                        optionString = '-' + explicitArg[0]
+                        newExplicitArg = explicitArg[1:] or None
+                        if optionString not in self._optionActions: raise _Fallback()
+                        action = self._optionActions[optionString]
+                        explicitArg = newExplicitArg
+                    elif argCount == 1:
+                        stop = start + 1
+                        actionTuples.append((action, [explicitArg]))
+                        break
+                    else:
+                        raise _Fallback()
+                else:
+                    first = start + 1
+                    m = action.pattern.match(pattern, first)
+                    if m is None: raise _Fallback()
+                    stop = first + len(m.group(1))
+                    actionTuples.append((action, args[first:stop]))
+                    break
+            for (action, strings) in actionTuples:
+                takeAction(action, strings)
+            return stop
+
+        positionals = list(self._positionals)
+        def consumePositionals(start):
+            counts = list()
+            for n in range(len(positionals), 0, -1):        # match as many positionals as possible
+                m = re.match(''.join(a.pattern.pattern for a in positionals[:n]), pattern[start:])
+                if m is not None:
+                    counts = [len(g) for g in m.groups()]
+                    break
+            for (action, count) in zip(positionals, counts):
+                takeAction(action, args[start:start + count])
+                start += count
+            positionals[:] = positionals[len(counts):]
+            return start
+
+        optionStarts = sorted(optionIndices)
+        start = 0
+        nextIndex = 0           # into optionStarts
+        while optionStarts and (start <= optionStarts[-1]):
+            while optionStarts[nextIndex] < start: nextIndex += 1
+            nextOption = optionStarts[nextIndex]
+            if start != nextOption:
+                positionalsEnd = consumePositionals(start) if positionals else start
+                if positionalsEnd > start:
+                    start = positionalsEnd
+                    continue
+            if start not in optionIndices:
+                extras.extend(args[start:nextOption])
+                start = nextOption
+            start = consumeOptional(start)
+        stop = consumePositionals(start) if positionals else start
+        extras.extend(args[stop:])
+
+        for action in self._checkAfter:
+            if id(action) in seen: continue
+            if action.required: raise _Fallback()       # argparse reports it
+            if action.default is getattr(namespace, action.dest, None):
+                setattr(namespace, action.dest, action.convert(action.default))
+        return namespace, extras
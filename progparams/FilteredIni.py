@@ -0,0 +1,117 @@
+
+'''
+Read only the wanted sections of ".ini" files into a configparser.
+
+A fleet wide .ini file (e.g. the one at "PrivateConfig") may hold thousands
+of [host], [location] and [prog/host] sections, but GetConfig only ever uses
+the handful in its section cascade.  ReadIniSections scans each file once,
+line by line, noting where every section starts and ends, and hands
+configparser only the lines of:
+    the [DEFAULT] section,
+    the requested sections, and
+    any section those reference with ${section:option} interpolation
+    (followed transitively).
+Every other section is skipped without being stored, so memory and parse time
+scale with the sections used rather than with the size of the file.  Sections
+found to be referenced are read from where the scan found them.
+
+Usage:
+
+config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
+filesUsed = ReadIniSections(config, configPaths, cfgSections)
+'''
+
+import re               #   https://docs.python.org/3/library/re.html
+import codecs           #   https://docs.python.org/3/library/codecs.html
+import locale           #   https://docs.python.org/3/library/locale.html
+import configparser     #   https://docs.python.org/3/library/configparser.html
+import logging          #   https://docs.python.org/3/library/logging.html
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+
+#  ${section:option} references of configparser.ExtendedInterpolation.
+#  Being generous here (e.g. also matching after "$$") only keeps an extra section.
+_sectionReference = re.compile(r"\$\{([^}:$]+):")
+
+def _indexFile(path, wanted, encoding, defaultSection, sectionHeader):
+    '''
+    Scan path once.  Return its sections in file order, as [header, start, end, lines or None]
+    with start and end byte offsets in the file, and the set of section names referenced
+    from the lines kept.  The lines and headers are left encoded; the lines are kept for
+    DEFAULT, the wanted sections and the lines before the first header (header None).
+    '''
+    #  Lines are matched undecoded, which is right for the ASCII compatible encodings .ini files use.
+    sectionHeader = re.compile(sectionHeader.pattern.encode(), sectionHeader.flags & ~re.UNICODE)
+    keepHeaders = {s.encode(encoding) for s in wanted} | {defaultSection.encode(encoding)}
+    referenced = set()
+    #  Lines before the first header go to configparser (which will complain as usual).
+    kept = list()
+    segments = [[None, 0, None, kept]]
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            mo = sectionHeader.match(line)
+            if mo is not None:
+                header = mo.group('header')
+                segments[-1][2] = offset
+                kept = list() if header in keepHeaders else None
+                segments.append([header, offset, None, kept])
+            if kept is not None:
+                kept.append(line)
+                if b'${' in line:
+                    referenced.update(_sectionReference.findall(line.decode(encoding)))
+            offset += len(line)
+    segments[-1][2] = offset
+    return segments, referenced
+
+def ReadIniSections(config: configparser.RawConfigParser, paths, sections, encoding=None) -> list:
+    '''
+    Like config.read(paths), but only the [DEFAULT] section, the given sections, and the
+    sections they reference through ${section:option} interpolation are loaded.
+
+    Parameters:
+        config          required: the configparser to load into.
+        paths           required: a file name or list of file names; files that cannot
+                        be opened are ignored, as config.read does.
+        sections        required: the section names that will be used.
+        encoding        optional: passed to open().
+    Returns the list of files successfully read.
+    '''
+    if isinstance(paths, str): paths = (paths,)
+    if encoding is None: encoding = locale.getpreferredencoding(False)      # as open() does
+    wanted = set(sections)
+    filesUsed = list()
+    indexes = dict()
+    referenced = set()
+    for path in paths:
+        try:
+            indexes[path], refs = _indexFile(path, wanted, encoding, config.default_section, config.SECTCRE)
+        except OSError:
+            continue
+        referenced |= refs
+        filesUsed.append(path)
+
+    #  Referenced sections are read from their place in the file, as are those they reference, ...
+    while not (referenced <= wanted):
+        debug("Sections also needed for interpolation: %s", referenced - wanted)
+        more = referenced - wanted
+        wanted |= more
+        moreHeaders = {s.encode(encoding) for s in more}
+        referenced = set()
+        for path in filesUsed:
+            with open(path, 'rb') as f:
+                for segment in indexes[path]:
+                    if segment[0] in moreHeaders:
+                        f.seek(segment[1])
+                        text = f.read(segment[2] - segment[1])
+                        segment[3] = [text]
+                        if b'${' in text:
+                            referenced.update(_sectionReference.findall(text.decode(encoding)))
+
+    for path in filesUsed:
+        text = b''.join(line for segment in indexes[path] if segment[3] is not None for line in segment[3])
+        #  As open() would in text mode.
+        config.read_string(codecs.decode(text, encoding).replace('\r\n', '\n'), source=path)
+    debug("Read sections %s from %s", config.sections(), filesUsed)
+    return filesUsed
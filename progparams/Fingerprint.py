@@ -0,0 +1,170 @@
+
+'''
+A stable fingerprint of the parameters that affect a program's results.
+
+The dictionary MakeParams returns also holds things that don't change results
+(paramFile, the boiler plate options, ...), so it can't be hashed as it is to key
+a cache of expensive results.  Mark the parameters that do affect results in
+the parameter definitions:
+
+    [[Parameters]]
+    paramName = "threshold"
+    affectsResults = true
+    ...
+
+and MakeParams returns a ParamFingerprint of them under "ParamsFingerprint".
+(If no parameter is marked, it covers nothing: hexdigest() is all zeros.)
+
+Each parameter is hashed on its own (name and canonical serialisation of the
+value: dict keys sorted, arrays by typecode/dtype and little endian bytes, ...)
+and the fingerprint is the sum of those hashes, so changing one value with
+update() costs only hashing that one value.
+
+Values must have a canonical form: None, bool, int, float, complex, str, bytes,
+arrays (but not numpy arrays of dtype object), dicts, lists, tuples and sets of these, enums, paths, dates and times,
+or objects whose class has a __fingerprint__() method returning one of these.
+Other values raise TypeError; their repr() usually holds a memory address, so
+hashing it would give a different fingerprint in every run.
+
+Usage:
+
+fp = params['ParamsFingerprint']
+key = fp.hexdigest()
+fp.update('threshold', 0.5)         # after changing params['threshold']
+'''
+
+import sys              #   https://docs.python.org/3/library/sys.html
+import array            #   https://docs.python.org/3/library/array.html
+import enum             #   https://docs.python.org/3/library/enum.html
+import struct           #   https://docs.python.org/3/library/struct.html
+import pathlib          #   https://docs.python.org/3/library/pathlib.html
+import datetime         #   https://docs.python.org/3/library/datetime.html
+import hashlib          #   https://docs.python.org/3/library/hashlib.html
+import logging          #   https://docs.python.org/3/library/logging.html
+try:
+    import numpy        #   https://numpy.org       optional
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+
+_modulus = 1 << 256
+
+def _feed(h, value):
+    '''Write a canonical, type tagged serialisation of value into hash h.'''
+    if value is None:
+        h.update(b'N')
+    elif isinstance(value, bool):
+        h.update(b'T' if value else b'F')
+    elif isinstance(value, int):
+        h.update(b'i%d;' % value)
+    elif isinstance(value, float):
+        h.update(b'f' + struct.pack('<d', value))
+    elif isinstance(value, str):
+        b = value.encode('utf-8')
+        h.update(b's%d:' % len(b)); h.update(b)
+    elif isinstance(value, bytes):
+        h.update(b'b%d:' % len(value)); h.update(value)
+    elif isinstance(value, array.array):
+        a = value
+        if sys.byteorder == 'big':
+            a = array.array(value.typecode, value); a.byteswap()
+        b = a.tobytes()
+        h.update(b'a' + value.typecode.encode() + b'%d:' % len(b)); h.update(b)
+    elif (numpy is not None) and isinstance(value, numpy.ndarray):
+        if value.dtype.hasobject:
+            #  tobytes() of an object array gives the addresses of its elements.
+            raise TypeError(f"No canonical form for numpy array of dtype {value.dtype}; "
+                            "convert it to a list, or to an array of numbers or strings.")
+        a = numpy.ascontiguousarray(value, dtype=value.dtype.newbyteorder('<'))
+        h.update(b'n' + a.dtype.str.encode() + repr(a.shape).encode() + b':'); h.update(a.tobytes())
+    elif isinstance(value, dict):
+        items = sorted(((Canonical(k), v) for (k, v) in value.items()), key=lambda kv: kv[0])
+        h.update(b'd%d:' % len(items))
+        for (k, v) in items:
+            h.update(k); _feed(h, v)
+    elif isinstance(value, (list, tuple)):
+        h.update(b'l%d:' % len(value))
+        for v in value: _feed(h, v)
+    elif isinstance(value, (set, frozenset)):
+        digests = sorted(Canonical(v) for v in value)
+        h.update(b'S%d:' % len(digests))
+        for d in digests: h.update(d)
+    elif isinstance(value, complex):
+        h.update(b'c' + struct.pack('<dd', value.real, value.imag))
+    elif isinstance(value, enum.Enum):
+        _feedTagged(h, b'e', value, value.name)
+    elif isinstance(value, pathlib.PurePath):
+        _feedTagged(h, b'p', value, str(value))
+    elif isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        #  date, datetime (a date), time, timedelta: their repr shows every field and no address.
+        _feedTagged(h, b't', value, repr(value))
+    elif hasattr(type(value), '__fingerprint__'):
+        _feedTagged(h, b'o', value, value.__fingerprint__())
+    else:
+        #  repr() of most objects holds their address, which differs from run to run.
+        raise TypeError(f"No canonical form for {type(value).__qualname__} value {value!r}; "
+                        "give its class a __fingerprint__() method returning one.")
+
+def _feedTagged(h, tag, value, form):
+    '''Write tag, the qualified name of value's type and its canonical form into hash h.'''
+    t = type(value)
+    h.update(tag)
+    _feed(h, f"{t.__module__}.{t.__qualname__}")
+    _feed(h, form)
+
+def Canonical(value) -> bytes:
+    '''The sha256 digest of the canonical serialisation of value.'''
+    h = hashlib.sha256()
+    _feed(h, value)
+    return h.digest()
+
+def _paramHash(name, value) -> int:
+    h = hashlib.sha256()
+    _feed(h, name)
+    _feed(h, value)
+    return int.from_bytes(h.digest(), 'big')
+
+class ParamFingerprint:
+    '''
+    Parameters:
+        params          required: the parameters dictionary.
+        names           required: the names of the parameters to cover.
+    '''
+    def __init__(self, params: dict, names):
+        self._hashes = dict()
+        self._sum = 0
+        for name in names:
+            self.update(name, params.get(name))
+
+    def update(self, name, value):
+        '''Record a new value for parameter "name" (adding it to those covered if need be).'''
+        new = _paramHash(name, value)
+        old = self._hashes.get(name, 0)
+        self._hashes[name] = new
+        self._sum = (self._sum - old + new) % _modulus
+
+    def remove(self, name):
+        '''Stop covering parameter "name".'''
+        self._sum = (self._sum - self._hashes.pop(name, 0)) % _modulus
+
+    @property
+    def names(self):
+        return frozenset(self._hashes)
+
+    def hexdigest(self) -> str:
+        return self._sum.to_bytes(32, 'big').hex()
+
+    def __eq__(self, other):
+        return isinstance(other, ParamFingerprint) and (self._sum == other._sum)
+
+    def __hash__(self):
+        return hash(self._sum)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.hexdigest()[:16]}..., {len(self._hashes)} params)"
+
+def FingerprintParams(params: dict, names) -> str:
+    '''The hex fingerprint of the named parameters.'''
+    return ParamFingerprint(params, names).hexdigest()
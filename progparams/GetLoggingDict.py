@@ -25,10 +25,15 @@ then create loggers like:
 
 errLogger = logging.getLogger("Debug  Logger")
 console = logging.getLogger("ConsoleLogger")
+
+To pick up changes to the configuration file while the program runs, without
+reopening handlers that did not change, use LoggingReload.LoggingConfigWatcher
+instead of logging.config.dictConfig.
 '''
 
 # __all__ = (
 #       GetLoggingDict
+#     , LoadLoggingDict
 #     , setConsoleLoggingLevel
 #     , getConsoleLoggingLevel
 #     , setLogFileLoggingLevel
@@ -38,12 +43,15 @@ console = logging.getLogger("ConsoleLogger")
 import os               #   https://docs.python.org/3/library/os.html
 import toml             #   https://github.com/uiri/toml    https://github.com/toml-lang/toml
 # comment json strips python and "//" comments form json before applying json.load routines.
-import commentjson      #   https://github.com/vaidik/commentjson       https://commentjson.readthedocs.io/en/latest/
+# It (with lark) is slow to import, so it is imported below only when a .json/.jsonc file is read.
+# import commentjson      #   https://github.com/vaidik/commentjson       https://commentjson.readthedocs.io/en/latest/
 # Lark is used by commentjson -- import commented out, but here for documentation.
 # import lark             #   https://github.com/lark-parser/lark    https://lark-parser.readthedocs.io/en/latest/
 import logging          #   https://docs.python.org/3/library/logging.html
 
-def GetLoggingDict(ProgName: str, ProgPath: str, *args, **kwargs) -> dict :
+def LoadLoggingDict(ProgName: str, ProgPath: str, *args, **kwargs) -> tuple :
+    '''As GetLoggingDict, but returns (configuration dictionary, path of the file it came from);
+    the path is None if no file was loaded.'''
     ##############Logging Settings##############
     #####  Setup logging; first try for file specific, and if it doesn't exist, use a folder setup file.
     #
@@ -64,7 +72,7 @@ def GetLoggingDict(ProgName: str, ProgPath: str, *args, **kwargs) -> dict :
 
     if kwargs.get('paths') is not None:
         paths = kwargs['paths']
-        if isinstance(paths, str): paths = list(paths)
+        if isinstance(paths, str): paths = [paths]
     else:
         paths = (     os.path.join(ProgPath, ProgName + '_loggingconf.toml')        # in order to be checked
                     , os.path.join(ProgPath, 'Loggingconf.toml')
@@ -80,15 +88,19 @@ def GetLoggingDict(ProgName: str, ProgPath: str, *args, **kwargs) -> dict :
             if ext == '.toml':
                 config_dict = toml.load(path)
             elif (ext == '.json') or (ext == '.jsonc'):
+                import commentjson
                 config_dict = commentjson.load(open(path))
             else:
                 continue
-            return updateLoggingDict(config_dict)
+            return updateLoggingDict(config_dict), path
         except Exception:
             print(f"Attempt to read existing file: {path} failed.  Trying another file.")
             pass
     print("Logging configuration file not found.")
-    return {}
+    return {}, None
+
+def GetLoggingDict(ProgName: str, ProgPath: str, *args, **kwargs) -> dict :
+    return LoadLoggingDict(ProgName, ProgPath, *args, **kwargs)[0]
 
 def setConsoleLoggingLevel(loggingLevel, LGR=None):
     '''
@@ -0,0 +1,121 @@
+
+'''
+A registry of the "--KeyWordParams" values given on the command line.
+
+Each KeyWordParams item has the form "<function ID>.<keyword>=<value>", where
+the function ID is what GetFunctionId returns for the function that is to see
+the value, e.g.:
+
+    --KeyWordParams ProgramParametersDefinitions.createParams.ConsoleLoggingLevel=10
+
+The registry splits every item ONCE, converts the value to a python object
+(int, float, bool, quoted string, list, ...) with ast.literal_eval, falling
+back to the raw string, and files it under its function ID.  Looking up the
+namespace for a function is then a single dict lookup, cheap enough to do
+from inside a loop rather than only at startup.
+
+Usage:
+
+from progparams.KeyWordRegistry import KeyWordRegistry
+kwr = KeyWordRegistry(params['KeyWordParams'])
+myKw = kwr.forFunction(GetFunctionId())
+level = myKw.get('ConsoleLoggingLevel')
+'''
+
+import ast              #   https://docs.python.org/3/library/ast.html
+import types            #   https://docs.python.org/3/library/types.html
+import logging          #   https://docs.python.org/3/library/logging.html
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+warning = logger.warning
+
+#  Returned for function IDs that have no key word params; read only so it can be shared.
+_emptyNamespace = types.MappingProxyType({})
+
+def convertKeyWordValue(value: str):
+    '''
+    Convert a KeyWordParams value string to a python object.
+    Anything that is not a python literal is kept as the string given.
+    '''
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return value
+
+class KeyWordRegistry:
+    '''
+    Parsed, typed KeyWordParams indexed by function ID.
+
+    Parameters:
+        keyWordParams   optional: an iterable of "<function ID>.<keyword>=<value>"
+                        strings, as returned in MakeParams' "KeyWordParams" entry.
+    Items without an "=" are ignored.  Items without a function ID prefix
+    (i.e. "<keyword>=<value>") are filed under the empty function ID "".
+    '''
+    def __init__(self, keyWordParams=None):
+        self._raw = dict()          # "<function ID>.<keyword>" -> value string, as kwargs has always had them.
+        self._byId = dict()         # "<function ID>" -> {keyword: converted value}
+        self._views = dict()        # "<function ID>" -> read only view of self._byId[<function ID>]
+        if keyWordParams is not None:
+            self.update(keyWordParams)
+
+    def update(self, keyWordParams):
+        '''Add more "<function ID>.<keyword>=<value>" items; later items override earlier ones.'''
+        if isinstance(keyWordParams, str): keyWordParams = (keyWordParams,)
+        for kwDef in keyWordParams:
+            kwDefParts = kwDef.split("=", maxsplit=1)
+            if len(kwDefParts) < 2:
+                warning('KeyWordParams item "%s" has no "="; ignored.', kwDef)
+                continue
+            fullKey, rawValue = kwDefParts
+            value = convertKeyWordValue(rawValue)
+            functionId, _, keyWord = fullKey.rpartition('.')
+            self._raw[fullKey] = rawValue
+            self._byId.setdefault(functionId, dict())[keyWord] = value
+            debug("KeyWordParams registry: [%r][%r] = %r", functionId, keyWord, value)
+        #  Rebuild the read only views handed out by forFunction.
+        self._views = {fid: types.MappingProxyType(ns) for (fid, ns) in self._byId.items()}
+        return self
+
+    def set(self, functionId: str, keyWord: str, value):
+        '''Set (or, with value None, remove) one key word param while the program runs, e.g. from LogControl.
+        The function's namespace is replaced, not changed, so readers never see it half done.'''
+        ns = dict(self._byId.get(functionId, _emptyNamespace))
+        fullKey = f"{functionId}.{keyWord}" if functionId else keyWord
+        if value is None:
+            ns.pop(keyWord, None)
+            self._raw.pop(fullKey, None)
+        else:
+            ns[keyWord] = value
+            self._raw[fullKey] = repr(value)
+        self._byId[functionId] = ns
+        self._views[functionId] = types.MappingProxyType(ns)
+
+    def forFunction(self, functionId: str):
+        '''Return a read only mapping of the key word params for functionId (empty if none).'''
+        return self._views.get(functionId, _emptyNamespace)
+
+    def get(self, functionId: str, keyWord: str, default=None):
+        '''Return one key word param for functionId, or default.'''
+        return self._byId.get(functionId, _emptyNamespace).get(keyWord, default)
+
+    def asKwargs(self) -> dict:
+        '''Return the unconverted "<function ID>.<keyword>": "<value>" dictionary that MakeParams puts in kwargs.'''
+        return dict(self._raw)
+
+    def functionIds(self):
+        return self._byId.keys()
+
+    def __contains__(self, functionId):
+        return functionId in self._byId
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __reduce__(self):
+        #  The read only views can't be pickled; rebuild from the items.
+        return (type(self), ([f"{k}={v}" for (k, v) in self._raw.items()],))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._byId!r})"
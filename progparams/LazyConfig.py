@@ -0,0 +1,87 @@
+
+'''
+A read only, lazily interpolated view of the cascade of ".ini" file sections
+that GetConfig merges.
+
+GetConfig used to merge its sections with {**cfgDict, **cfg}, which makes
+configparser interpolate every option of every matched section.  With
+ExtendedInterpolation and deep ${section:option} chains that is most of the
+cost of reading a big shared .ini file, although createParams usually looks
+up only the options named by some parameter's "configName".
+
+A LazyConfig resolves an option only when it is looked up, searching the
+sections last to first (so later sections override earlier ones, as before),
+and remembers the result.  If "names" is given, only those option names are
+visible at all, so nothing else is ever interpolated.
+
+Usage:
+
+cfg = LazyConfig(config, ('host', 'prog.py'), names={'count', 'name'})
+cfg.get('count')
+'''
+
+import logging          #   https://docs.python.org/3/library/logging.html
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+
+_missing = object()     # cache marker for options that are in none of the sections
+
+class LazyConfig(Mapping):
+    '''
+    Parameters:
+        config          required: a configparser.ConfigParser.
+        sections        required: section names in override order; sections not
+                        in config are skipped.
+        names           optional: an iterable of option names; if given, no other
+                        options are visible or interpolated.
+    '''
+    def __init__(self, config, sections, names=None):
+        self._config = config
+        #  Searched last to first, so the last section with an option wins.
+        self._sections = tuple(reversed([s for s in sections if s in config]))
+        self._names = None if names is None else frozenset(config.optionxform(n) for n in names if n is not None)
+        self._cache = dict()
+
+    def __getitem__(self, option):
+        try:
+            value = self._cache[option]
+        except KeyError:
+            value = self._cache[option] = self._lookup(option)
+        if value is _missing:
+            raise KeyError(option)
+        return value
+
+    def _lookup(self, option):
+        key = self._config.optionxform(option)
+        if (self._names is not None) and (key not in self._names):
+            return _missing
+        for section in self._sections:
+            if self._config.has_option(section, key):
+                debug("Interpolating option %r from section [%s]", key, section)
+                return self._config.get(section, key)
+        return _missing
+
+    def __iter__(self):
+        seen = set()
+        for section in reversed(self._sections):
+            for option in self._config[section]:
+                if (option in seen) or ((self._names is not None) and (option not in self._names)): continue
+                seen.add(option)
+                yield option
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, option):
+        return self.get(option, _missing) is not _missing
+
+    @property
+    def sections(self):
+        '''The sections that are searched, in override order.'''
+        return tuple(reversed(self._sections))
+
+    def __repr__(self):
+        #  Don't show values; that would interpolate all of them.
+        return f"{type(self).__name__}(sections={self.sections!r}, resolved={len(self._cache)})"
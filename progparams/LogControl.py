@@ -0,0 +1,266 @@
+
+'''
+Change logging levels of a running program, and change them back, without a restart.
+
+The function ID logging levels (--KeyWordParams <function ID>.ConsoleLoggingLevel=...)
+and -v/-q are fixed when the program starts.  A LogControl watches a small
+control file (and optionally SIGUSR1/SIGUSR2) and, while the file exists:
+    sets levels of named loggers,
+    sets the console and log file handler levels (setConsoleLoggingLevel,
+        setLogFileLoggingLevel),
+    sets console and log file levels of single functions: ConsoleLoggingLevel
+        and FileLoggingLevel of a function ID ("<module>.<function>", as
+        GetFunctionId) apply to the records that function logs,
+    sets any other key word params of function IDs in the program's
+        KeyWordRegistry, for code that looks them up while it runs.
+Everything is put back as it was when the file is removed or changed, after
+"revertAfter" seconds, on SIGUSR2, or on stop().
+
+Function levels lower the level of the loggers named after the function's module
+(as logging.getLogger(__name__) names them; "__main__" for the program file) and
+of the root logger's console and file handlers, and add a filter to each that
+holds every other function's records to the level it had before.  Only those
+loggers and handlers, and only while the control file asks for it, pay for the
+filter; loggers whose levels are not changed keep their own level caches, so
+code whose levels are not changed pays nothing.
+
+Control file (TOML), by default <ProgPath>/<ProgName>_logcontrol.toml:
+
+    revertAfter = 600                   # seconds; optional
+    consoleLevel = "DEBUG"              # optional; level names or numbers
+    fileLevel = 10                      # optional
+    [loggers]
+    "progparams.ProgramParametersDefinitions" = "DEBUG"
+    [functions."ProgramParametersDefinitions.createParams"]
+    ConsoleLoggingLevel = 10
+    FileLoggingLevel = "DEBUG"
+
+Usage:
+
+from progparams.LogControl import LogControl
+logControl = LogControl(ProgName, ProgPath, registry=params['KeyWordRegistry']).start()
+logControl.installSignalHandlers()          # optional; from the main thread
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import time             #   https://docs.python.org/3/library/time.html
+import signal           #   https://docs.python.org/3/library/signal.html
+import threading        #   https://docs.python.org/3/library/threading.html
+import toml             #   https://github.com/uiri/toml    https://github.com/toml-lang/toml
+import logging          #   https://docs.python.org/3/library/logging.html
+from progparams.GetLoggingDict import setConsoleLoggingLevel, setLogFileLoggingLevel
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+info = logger.info
+warning = logger.warning
+
+def _level(value):
+    '''A logging level from a number or a level name.'''
+    if isinstance(value, int): return value
+    level = logging.getLevelName(str(value).upper())
+    if not isinstance(level, int): raise ValueError(f"Unknown logging level {value!r}")
+    return level
+
+def _rootHandlers():
+    '''The handlers setConsoleLoggingLevel/setLogFileLoggingLevel change.'''
+    return list(logging.getLogger().handlers)
+
+#  Key word params of a function ID that set the level of its records on console and log file handlers.
+_functionLevelKeyWords = {'ConsoleLoggingLevel': 'console', 'FileLoggingLevel': 'file'}
+
+class _FunctionLevelFilter(logging.Filter):
+    '''
+    Passes the records of the function IDs in levels at or above their own level,
+    and every other record at or above level: the level of the logger or handler
+    it is added to, before LogControl lowered that.
+    '''
+    def __init__(self, levels: dict, level: int):
+        super().__init__()
+        self.levels = levels
+        self.level = level
+
+    def filter(self, record):
+        return record.levelno >= self.levels.get(f"{record.module}.{record.funcName}", self.level)
+
+def _moduleLoggers(module):
+    '''The existing loggers a module named module logs to, as logging.getLogger(__name__).'''
+    mainFile = getattr(sys.modules.get('__main__'), '__file__', None) or ''
+    loggers = list()
+    for (name, lgr) in list(logging.Logger.manager.loggerDict.items()):
+        if not isinstance(lgr, logging.Logger): continue
+        if (name.rpartition('.')[2] == module) or ((name == '__main__') and (os.path.splitext(os.path.basename(mainFile))[0] == module)):
+            loggers.append(lgr)
+    return loggers
+
+class LogControl:
+    '''
+    Parameters:
+        ProgName        required first argument: is the name of the program.
+        ProgPath        required second argument: is the path to the program.
+    Keyword parameters:
+        path            optional: the control file; default <ProgPath>/<ProgName>_logcontrol.toml
+        registry        optional: the program's KeyWordRegistry, for [functions] key word params
+                        other than ConsoleLoggingLevel and FileLoggingLevel.
+        interval        optional: seconds between looks at the control file; default 2.
+    '''
+    def __init__(self, ProgName: str, ProgPath: str, path=None, registry=None, interval=2.0):
+        self.path = path or os.path.join(ProgPath, ProgName + '_logcontrol.toml')
+        self.registry = registry
+        self.interval = interval
+        self._stamp = None          # (st_mtime_ns, st_size) of the control file applied
+        self._undo = list()         # functions that put back what was changed, last first
+        self._revertAt = None
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._reread = False
+        self._revertNow = False
+        self._stop = False
+        self._thread = None
+
+    ##########  Applying and reverting  ##########
+    def apply(self, control: dict):
+        '''Apply a control dictionary (as read from the control file); reverts any earlier one first.'''
+        with self._lock:
+            self.revert()
+            for (name, level) in (control.get('loggers') or dict()).items():
+                lgr = logging.getLogger(name)
+                self._undo.append(lambda lgr=lgr, old=lgr.level: lgr.setLevel(old))
+                lgr.setLevel(_level(level))
+                info(f'Logger "{name}" level set to {logging.getLevelName(lgr.level)} by {self.path}')
+            if (control.get('consoleLevel') is not None) or (control.get('fileLevel') is not None):
+                saved = [(h, h.level) for h in _rootHandlers()]
+                self._undo.append(lambda saved=saved: [h.setLevel(old) for (h, old) in saved])
+                if control.get('consoleLevel') is not None:
+                    setConsoleLoggingLevel(_level(control['consoleLevel']))
+                if control.get('fileLevel') is not None:
+                    setLogFileLoggingLevel(_level(control['fileLevel']))
+            functionLevels = {'console': dict(), 'file': dict()}    # handler kind -> {function ID: level}
+            for (functionId, keyWords) in (control.get('functions') or dict()).items():
+                for (keyWord, value) in keyWords.items():
+                    if keyWord in _functionLevelKeyWords:
+                        functionLevels[_functionLevelKeyWords[keyWord]][functionId] = _level(value)
+                    elif self.registry is None:
+                        warning(f"{self.path} sets {functionId}.{keyWord} but no KeyWordRegistry was given; ignored.")
+                    else:
+                        old = self.registry.get(functionId, keyWord)
+                        self._undo.append(lambda f=functionId, k=keyWord, old=old: self.registry.set(f, k, old))
+                        self.registry.set(functionId, keyWord, value)
+                        info(f'Key word param {functionId}.{keyWord} set to {value!r} by {self.path}')
+            self._applyFunctionLevels(functionLevels)
+            if control.get('revertAfter') is not None:
+                self._revertAt = time.monotonic() + float(control['revertAfter'])
+
+    def _lowerWithFilter(self, filterer, levels: dict, level: int, setLevel):
+        '''Lower filterer (a logger or handler now at level) to the lowest of levels, with
+        a filter holding other records to level.'''
+        lowest = min(levels.values(), default=level)
+        if lowest >= level: return
+        f = _FunctionLevelFilter(levels, level)
+        oldLevel = filterer.level
+        def undo():
+            filterer.removeFilter(f)
+            setLevel(oldLevel)
+        self._undo.append(undo)
+        filterer.addFilter(f)
+        setLevel(lowest)
+
+    def _applyFunctionLevels(self, functionLevels: dict):
+        '''Let the records of single functions through loggers and root handlers at their own levels.'''
+        allLevels = dict()
+        for levels in functionLevels.values():
+            for (functionId, level) in levels.items():
+                allLevels[functionId] = min(level, allLevels.get(functionId, level))
+        if not allLevels: return
+        for (functionId, level) in allLevels.items():
+            module = functionId.rpartition('.')[0]
+            loggers = _moduleLoggers(module)
+            if not loggers: warning(f'No logger for module "{module}" of function ID {functionId}; its records are not lowered.')
+            for lgr in loggers:
+                #  Each logger gets one filter, for all the function IDs of its module.
+                if any(isinstance(f, _FunctionLevelFilter) for f in lgr.filters): continue
+                levels = {fid: lvl for (fid, lvl) in allLevels.items() if fid.rpartition('.')[0] == module}
+                self._lowerWithFilter(lgr, levels, lgr.getEffectiveLevel(), lgr.setLevel)
+            info(f'Function {functionId} logging level set to {logging.getLevelName(level)} by {self.path}')
+        for h in _rootHandlers():
+            kind = 'file' if isinstance(h, logging.FileHandler) else 'console' if isinstance(h, logging.StreamHandler) else None
+            if (kind is not None) and functionLevels[kind]:
+                self._lowerWithFilter(h, functionLevels[kind], h.level, h.setLevel)
+
+    def revert(self):
+        '''Put back everything the control file changed.'''
+        with self._lock:
+            if self._undo: info(f"Reverting logging changes made by {self.path}")
+            while self._undo:
+                self._undo.pop()()
+            self._revertAt = None
+
+    def check(self):
+        '''Look at the control file once; apply it if it is new or changed, revert if it is gone or expired.'''
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        with self._lock:
+            if stamp != self._stamp:
+                self._stamp = stamp
+                if stamp is None:
+                    self.revert()
+                else:
+                    try:
+                        self.apply(toml.load(self.path))
+                    except (toml.TomlDecodeError, OSError, ValueError, TypeError, AttributeError) as e:
+                        warning(f"Logging control file {self.path} not applied: {e}")
+                        self.revert()
+            elif (self._revertAt is not None) and (time.monotonic() >= self._revertAt):
+                self.revert()
+
+    ##########  Watching  ##########
+    def start(self):
+        '''Look at the control file now, then every "interval" seconds in a daemon thread.'''
+        self.check()
+        self._stop = False
+        self._thread = threading.Thread(target=self._watch, name="LogControl", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        '''Stop watching, and revert.'''
+        self._stop = True
+        self._wake.set()
+        if (self._thread is not None) and (self._thread is not threading.current_thread()):
+            self._thread.join()
+        self._thread = None
+        self.revert()
+
+    def _watch(self):
+        while not self._stop:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop: break
+            if self._revertNow:
+                self._revertNow = False
+                self.revert()
+                continue
+            if self._reread:
+                self._reread = False
+                self._stamp = None      # apply even if unchanged
+            self.check()
+
+    def installSignalHandlers(self, applySignal=signal.SIGUSR1, revertSignal=signal.SIGUSR2):
+        '''
+        Make applySignal re-read the control file and revertSignal revert, at once.
+        Must be called from the main thread.  The handlers only wake the watching
+        thread; logging isn't touched from inside a signal handler.
+        '''
+        def onApply(signum, frame):
+            self._reread = True
+            self._wake.set()
+        def onRevert(signum, frame):
+            self._revertNow = True
+            self._wake.set()
+        signal.signal(applySignal, onApply)
+        signal.signal(revertSignal, onRevert)
+        return self
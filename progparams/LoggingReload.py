@@ -0,0 +1,280 @@
+
+'''
+Re-apply a changed logging configuration file to a running program, touching
+only what changed.
+
+logging.config.dictConfig tears down every handler and builds new ones: log
+files are closed and reopened, and records held by buffering handlers are lost.
+ReapplyLoggingDict(old, new) compares two logging dictionaries (as GetLoggingDict
+returns) and changes only:
+    handlers        level, formatter and filters are changed on the handler itself;
+                    any other change (class, filename, ...) builds a new handler,
+                    which replaces the old one where it was attached before the
+                    old one is flushed and closed.  Removed handlers are detached
+                    and closed; new handlers are built.
+    filters         changed filters are rebuilt and replaced where they are used.
+    formatters      handlers using a changed formatter get the new one.
+    loggers         level, propagate, handlers and filters of changed loggers
+                    (including root).  Loggers no longer configured are reset
+                    (NOTSET, propagate, no configured handlers or filters).
+Handlers and filters added by the program itself, not by the configuration,
+are left alone.  "disable_existing_loggers" only applies at start up.
+
+LoggingConfigWatcher does it when the configuration file changes: it keeps
+the path GetLoggingDict resolved, and looks at its modification time and size
+every "interval" seconds; the file is only read when that changes.
+
+Usage, instead of logging.config.dictConfig(GetLoggingDict(ProgName, ProgPath)):
+
+from progparams.LoggingReload import LoggingConfigWatcher
+loggingWatcher = LoggingConfigWatcher(ProgName, ProgPath).start()
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import copy             #   https://docs.python.org/3/library/copy.html
+import threading        #   https://docs.python.org/3/library/threading.html
+import logging          #   https://docs.python.org/3/library/logging.html
+import logging.config   #   https://docs.python.org/3/library/logging.config.html
+from progparams.GetLoggingDict import LoadLoggingDict
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+info = logger.info
+warning = logger.warning
+
+#  Handler settings that can be changed on a running handler.
+_inPlaceHandlerKeys = ('level', 'formatter', 'filters')
+
+def _handlerByName(name):
+    getHandlerByName = getattr(logging, 'getHandlerByName', None)      # python 3.12+
+    if getHandlerByName is not None: return getHandlerByName(name)
+    return logging._handlers.get(name)
+
+def _loggerConfigs(d: dict) -> dict:
+    '''{logger name: its configuration}, root under "".'''
+    loggers = dict(d.get('loggers') or dict())
+    if 'root' in d: loggers[''] = d['root']
+    return loggers
+
+def _level(cfg, default=logging.NOTSET):
+    level = cfg.get('level')
+    return default if level is None else logging._checkLevel(level)
+
+def _changedNames(old: dict, new: dict):
+    '''Names whose entries differ (or are only in one of old, new).'''
+    return {n for n in set(old) | set(new) if old.get(n) != new.get(n)}
+
+def ReapplyLoggingDict(old: dict, new: dict) -> bool:
+    '''
+    Change the running logging configuration, set up from the dictionary old,
+    to the dictionary new, touching only what differs.  Returns True if anything changed.
+
+    Everything new is built and checked before anything running is changed: if new
+    can't be applied, handlers built for it are closed, ValueError is raised and the
+    running configuration is as it was.
+    '''
+    if new.get('incremental'):
+        logging.config.dictConfig(new)      # dictConfig only changes levels for these itself.
+        return True
+    if old == new: return False
+    configurator = logging.config.DictConfigurator(copy.deepcopy(new))
+    cfg = configurator.config
+    oldFormatters, newFormatters = old.get('formatters') or dict(), new.get('formatters') or dict()
+    oldFilters, newFilters = old.get('filters') or dict(), new.get('filters') or dict()
+    oldHandlers, newHandlers = old.get('handlers') or dict(), new.get('handlers') or dict()
+    oldLoggers, newLoggers = _loggerConfigs(old), _loggerConfigs(new)
+    changedFormatters = _changedNames(oldFormatters, newFormatters)
+    changedFilters = _changedNames(oldFilters, newFilters)
+
+    #  dictConfig builds formatters and filters before handlers, and looks them up in its config.
+    try:
+        formatters = cfg.get('formatters') or dict()
+        for name in formatters:
+            formatters[name] = configurator.configure_formatter(formatters[name])
+        filters = cfg.get('filters') or dict()
+        for name in filters:
+            filters[name] = configurator.configure_filter(filters[name])
+    except Exception as e:
+        raise ValueError(f'Unable to configure formatter or filter "{name}"') from e
+    def configuredFilters(names):
+        unknown = [n for n in names or () if n not in filters]
+        if unknown: raise ValueError(f'Unknown filters {unknown}')
+        return [filters[n] for n in names or ()]
+    def swapFilters(filterer, oldNames, newFilterList):
+        #  Configured filters are added when the handler or logger is configured, so they come
+        #  first; ones the program added afterwards follow and are kept.
+        filterer.filters = newFilterList + filterer.filters[len(oldNames or ()):]
+
+    ##########  Plan: nothing running is changed until everything new is built  ##########
+    handlers = dict()           # name -> handler object in the new configuration
+    replaced = dict()           # old handler object -> new one (None if removed)
+    built = dict()              # name -> newly built handler
+    inPlace = list()            # (name, handler, level or None, formatter changed, filters or None)
+    loggerPlan = list()         # (name, logger, old and new configuration, level or None, filters or None)
+    try:
+        toBuild = list()
+        for name in sorted(set(oldHandlers) | set(newHandlers)):
+            o, n = oldHandlers.get(name), newHandlers.get(name)
+            h = _handlerByName(name) if o is not None else None
+            if n is None:
+                if h is not None: replaced[h] = None
+                continue
+            if (h is None) or ({k: v for (k, v) in o.items() if k not in _inPlaceHandlerKeys}
+                                != {k: v for (k, v) in n.items() if k not in _inPlaceHandlerKeys}):
+                toBuild.append(name)
+                continue
+            handlers[name] = h
+            level = _level(n) if o.get('level') != n.get('level') else None
+            formatterChanged = (o.get('formatter') != n.get('formatter')) or (n.get('formatter') in changedFormatters)
+            if formatterChanged and (n.get('formatter') is not None) and (n.get('formatter') not in formatters):
+                raise ValueError(f'Unknown formatter "{n.get("formatter")}" for handler "{name}"')
+            newFilterList = None
+            if (o.get('filters') != n.get('filters')) or changedFilters.intersection(n.get('filters') or ()):
+                newFilterList = configuredFilters(n.get('filters'))
+            if (level is not None) or formatterChanged or (newFilterList is not None):
+                inPlace.append((name, h, level, formatterChanged, newFilterList))
+
+        #  Handlers referring to other handlers (e.g. MemoryHandler "target") find them in the config.
+        #  New handlers get their names only when they are swapped in.
+        cfg['handlers'] = dict(handlers)
+        while toBuild:
+            deferred = list()
+            for name in toBuild:
+                try:
+                    h = configurator.configure_handler(copy.deepcopy(newHandlers[name]))
+                except (ValueError, KeyError):
+                    if 'target' in newHandlers[name]:
+                        deferred.append(name)       # its target may not be built yet
+                        continue
+                    raise
+                built[name] = handlers[name] = cfg['handlers'][name] = h
+                previous = _handlerByName(name) if name in oldHandlers else None
+                if previous is not None: replaced[previous] = h
+            if len(deferred) == len(toBuild):
+                raise ValueError(f'Unable to configure handlers {deferred}')
+            toBuild = deferred
+
+        for name in set(oldLoggers) | set(newLoggers):
+            o, n = oldLoggers.get(name) or dict(), newLoggers.get(name)
+            lgr = logging.getLogger(name or None)
+            if (n is not None) and (o == n) and not set(replaced).intersection(lgr.handlers) and not changedFilters.intersection(n.get('filters') or ()):
+                continue
+            if n is None: n = dict()
+            unknown = [hn for hn in n.get('handlers') or () if hn not in handlers]
+            if unknown: raise ValueError(f'Unknown handlers {unknown} for logger "{name or "root"}"')
+            level = _level(n, logging.NOTSET if name else logging.WARNING) if o.get('level') != n.get('level') else None
+            newFilterList = None
+            if (o.get('filters') != n.get('filters')) or changedFilters.intersection(n.get('filters') or ()):
+                newFilterList = configuredFilters(n.get('filters'))
+            loggerPlan.append((name, lgr, o, n, level, newFilterList))
+    except Exception as e:
+        #  Roll back: nothing running has been touched; close what was built for new.
+        for h in built.values():
+            h.close()
+        raise ValueError(f'Unable to apply logging configuration: {e}') from e
+
+    ##########  Swap in: handlers changed in place  ##########
+    for (name, h, level, formatterChanged, newFilterList) in inPlace:
+        if level is not None: h.setLevel(level)
+        if formatterChanged: h.setFormatter(formatters.get(newHandlers[name].get('formatter')))
+        if newFilterList is not None: swapFilters(h, oldHandlers[name].get('filters'), newFilterList)
+        debug('Handler "%s" changed in place.', name)
+
+    #  Handlers kept in place whose target (e.g. MemoryHandler) was rebuilt.
+    for (name, h) in handlers.items():
+        target = newHandlers[name].get('target')
+        if (name not in built) and (target in handlers) and (getattr(h, 'target', None) in replaced):
+            h.setTarget(handlers[target])
+
+    ##########  Loggers  ##########
+    for (name, lgr, o, n, level, newFilterList) in loggerPlan:
+        configured = {_handlerByName(hn) for hn in o.get('handlers') or ()} | set(replaced)
+        if level is not None: lgr.setLevel(level)
+        lgr.propagate = n.get('propagate', True) if name else lgr.propagate
+        #  Keep handlers the program added itself; swap in the configured ones.
+        lgr.handlers = ([h for h in lgr.handlers if h not in configured]
+                        + [handlers[hn] for hn in n.get('handlers') or ()])
+        if newFilterList is not None: swapFilters(lgr, o.get('filters'), newFilterList)
+        debug('Logger "%s" reconfigured.', name or 'root')
+
+    ##########  Retire replaced handlers, then name the new ones  ##########
+    for (h, successor) in replaced.items():
+        h.flush()
+        h.close()           # also forgets its name
+        if successor is None: info(f'Logging handler "{h.name}" removed.')
+    for (name, h) in built.items():
+        h.name = name
+        info(f'Logging handler "{name}" {"rebuilt" if name in oldHandlers else "added"}.')
+    return True
+
+class LoggingConfigWatcher:
+    '''
+    Parameters:
+        ProgName        required first argument: is the name of the program.
+        ProgPath        required second argument: is the path to the program.
+    Keyword parameters:
+        paths           optional: as for GetLoggingDict.
+        interval        optional: seconds between looks at the configuration file; default 5.
+        configure       optional: apply the configuration with dictConfig now; default True.
+                        With False, the program has already applied the current file.
+    '''
+    def __init__(self, ProgName: str, ProgPath: str, paths=None, interval=5.0, configure=True):
+        self.ProgName, self.ProgPath, self.paths = ProgName, ProgPath, paths
+        self.interval = interval
+        self.config, self.path = LoadLoggingDict(ProgName, ProgPath, paths=paths)
+        self._stamp = self._statPath()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if configure and self.config:
+            logging.config.dictConfig(self.config)
+
+    def _statPath(self):
+        if self.path is None: return None
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def check(self) -> bool:
+        '''Look at the configuration file once; re-apply it if it changed.  Returns True if re-applied.'''
+        with self._lock:
+            stamp = self._statPath()
+            #  No file found at start, or already reported gone: nothing to watch.
+            if stamp == self._stamp: return False
+            #  Changed, or gone (then GetLoggingDict looks for the next file in its list).
+            config, path = LoadLoggingDict(self.ProgName, self.ProgPath, paths=self.paths)
+            if not config:
+                if self.path is not None: warning(f"Logging configuration {self.path} gone or unreadable; logging unchanged.")
+                self._stamp = stamp
+                return False
+            self.path = path
+            #  A file that can't be applied is not retried until it changes again; the
+            #  running configuration is still self.config, as ReapplyLoggingDict rolls back.
+            self._stamp = self._statPath()
+            try:
+                changed = ReapplyLoggingDict(self.config, config)
+            except ValueError as e:
+                warning(f"Logging configuration {path} not applied; logging unchanged: {e}")
+                return False
+            self.config = config
+            if changed: info(f"Logging configuration re-applied from {path}")
+            return changed
+
+    def start(self):
+        '''Look at the configuration file every "interval" seconds in a daemon thread.'''
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="LoggingConfigWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if (self._thread is not None) and (self._thread is not threading.current_thread()):
+            self._thread.join()
+        self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            self.check()
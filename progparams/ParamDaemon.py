@@ -0,0 +1,321 @@
+
+'''
+An optional local daemon that resolves program parameters for short-lived programs.
+
+Each program that calls MakeParams pays for importing progparams, finding and
+parsing its definitions and .ini files, and validating the definitions.  A
+ParamDaemon keeps all of that warm: definitions and configurations are cached
+in the daemon process, and re-read only when a file's modification time or
+size changes.  It serves ResolveParams over a Unix domain socket.
+
+MakeParams asks the daemon first (AskParamDaemon) if its socket exists, and
+resolves the parameters itself if the daemon is not running, does not answer,
+or cannot handle the request:
+    --help, which the program prints itself;
+    definitions that include parameter groups, which are loaded lazily in the
+        calling process;
+    definitions with expressions whose values depend on the process evaluating
+        them (e.g. a default reading os.environ, sys.argv or ProgName; see
+        ProcessDependentExpressions), which the daemon would evaluate as itself;
+    results that have no JSON form below.
+
+Start the daemon with:
+    python3 -m progparams.ParamDaemon [--socket <path>]
+
+The socket is <$XDG_RUNTIME_DIR or temp dir/progparams-<uid>>/ParamDaemon.sock,
+or the path in the PROGPARAMS_SOCKET environment variable.  The directory it is
+in must belong to the user and be for the user only (mode 700); the daemon
+creates the temp dir one that way, and neither side uses a socket in any other
+directory.  The client also checks after connecting that the daemon runs as
+the same user (SO_PEERCRED, or LOCAL_PEERCRED on macOS).
+
+Requests and replies are JSON.  Values JSON has no type for (tuples, sets,
+dicts with keys that are not strings, bytes, arrays, KeyWordRegistry and the
+ParamsFingerprint, which the client computes again) are sent as objects tagged
+with "__progparams__"; a result holding anything else is resolved in process.
+
+Warnings and errors logged while resolving (e.g. unknown command line options)
+are sent back and logged again by the program, under the same logger names;
+less severe messages appear only in the daemon's log.
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import signal           #   https://docs.python.org/3/library/signal.html
+import stat             #   https://docs.python.org/3/library/stat.html
+import json             #   https://docs.python.org/3/library/json.html
+import array            #   https://docs.python.org/3/library/array.html
+import socket           #   https://docs.python.org/3/library/socket.html
+import socketserver     #   https://docs.python.org/3/library/socketserver.html
+import struct           #   https://docs.python.org/3/library/struct.html
+import tempfile         #   https://docs.python.org/3/library/tempfile.html
+import threading        #   https://docs.python.org/3/library/threading.html
+import argparse         #   https://docs.python.org/3/library/argparse.html
+import logging          #   https://docs.python.org/3/library/logging.html
+from progparams.KeyWordRegistry import KeyWordRegistry
+from progparams.Fingerprint import ParamFingerprint
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+info = logger.info
+warning = logger.warning
+
+#  Options that make argparse print and exit; leave those to the program itself.
+_exitingOptions = ('-h', '--help')
+_header = struct.Struct('!I')       # length of the message that follows
+ConnectTimeout = 0.2                # seconds; the daemon is local, so it answers at once or not at all
+ReplyTimeout = 30.0
+RequestTimeout = 2.0                # seconds the daemon waits for a connected client to send its request
+
+def DefaultSocketPath(environ=None) -> str:
+    if environ is None: environ = os.environ
+    if environ.get('PROGPARAMS_SOCKET'):
+        return environ['PROGPARAMS_SOCKET']
+    runDir = environ.get('XDG_RUNTIME_DIR') or os.path.join(tempfile.gettempdir(), f"progparams-{os.getuid()}")
+    return os.path.join(runDir, 'ParamDaemon.sock')
+
+def _socketDirectoryProblem(directory, create=False):
+    '''
+    Why directory is not safe for the daemon's socket, or None if it is: it must be a
+    directory (not a link) that belongs to us, with no permissions for anyone else.
+    With create, make it (mode 700) if it is not there.
+    '''
+    if create:
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            return str(e)
+    try:
+        st = os.lstat(directory)
+    except OSError as e:
+        return str(e)
+    if not stat.S_ISDIR(st.st_mode): return "it is not a directory"
+    if st.st_uid != os.getuid(): return f"it belongs to uid {st.st_uid}"
+    if st.st_mode & 0o077: return f"its mode is {stat.S_IMODE(st.st_mode):o}, not 700"
+    return None
+
+def _peerUid(s):
+    '''The user id of the process at the other end of the connected Unix socket s, or None if unknown.'''
+    if hasattr(socket, 'SO_PEERCRED'):                  # linux: struct ucred {pid, uid, gid}
+        creds = struct.Struct('3i')
+        (pid, uid, gid) = creds.unpack(s.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, creds.size))
+        return uid
+    if sys.platform == 'darwin':                        # struct xucred {cr_version, cr_uid, ...}
+        SOL_LOCAL, LOCAL_PEERCRED = 0, getattr(socket, 'LOCAL_PEERCRED', 1)
+        creds = struct.Struct('2I')
+        (version, uid) = creds.unpack(s.getsockopt(SOL_LOCAL, LOCAL_PEERCRED, 76)[:creds.size])
+        return uid
+    return None
+
+##########  JSON form of resolved parameters  ##########
+_tag = '__progparams__'
+
+class _FingerprintNames(tuple):
+    '''Names of the parameters a ParamsFingerprint covers; the client fingerprints them again.'''
+
+def _encode(value):
+    '''value as JSON data; TypeError if it has no JSON form.'''
+    t = type(value)
+    if (value is None) or (t in (bool, int, float, str)): return value
+    if t is list: return [_encode(v) for v in value]
+    if t is dict:
+        if all(type(k) is str for k in value) and (_tag not in value):
+            return {k: _encode(v) for (k, v) in value.items()}
+        return {_tag: 'dict', 'items': [[_encode(k), _encode(v)] for (k, v) in value.items()]}
+    if t in (tuple, set, frozenset): return {_tag: t.__name__, 'items': [_encode(v) for v in value]}
+    if t is bytes: return {_tag: 'bytes', 'hex': value.hex()}
+    if t is array.array: return {_tag: 'array', 'typecode': value.typecode, 'items': value.tolist()}
+    numpy = sys.modules.get('numpy')        # only if the daemon uses it already
+    if (numpy is not None) and (t is numpy.ndarray):
+        return {_tag: 'ndarray', 'dtype': value.dtype.str, 'shape': list(value.shape), 'items': value.ravel().tolist()}
+    if t is KeyWordRegistry: return {_tag: 'KeyWordRegistry', 'items': [f"{k}={v}" for (k, v) in value.asKwargs().items()]}
+    if t is ParamFingerprint: return {_tag: 'ParamFingerprint', 'names': sorted(value.names)}
+    raise TypeError(f"{t.__qualname__} value has no JSON form")
+
+def _decode(data):
+    '''The value _encode made data from.'''
+    if type(data) is list: return [_decode(v) for v in data]
+    if type(data) is not dict: return data
+    kind = data.get(_tag)
+    if kind is None: return {k: _decode(v) for (k, v) in data.items()}
+    if kind == 'dict': return {_decode(k): _decode(v) for (k, v) in data['items']}
+    if kind == 'tuple': return tuple(_decode(v) for v in data['items'])
+    if kind == 'set': return set(_decode(v) for v in data['items'])
+    if kind == 'frozenset': return frozenset(_decode(v) for v in data['items'])
+    if kind == 'bytes': return bytes.fromhex(data['hex'])
+    if kind == 'array': return array.array(data['typecode'], data['items'])
+    if kind == 'ndarray':
+        import numpy        #   https://numpy.org
+        return numpy.array(data['items'], dtype=numpy.dtype(data['dtype'])).reshape(data['shape'])
+    if kind == 'KeyWordRegistry': return KeyWordRegistry(data['items'])
+    if kind == 'ParamFingerprint': return _FingerprintNames(data['names'])
+    raise ValueError(f"Unknown {_tag} value {kind!r}")
+
+def _send(f, data: bytes):
+    f.write(_header.pack(len(data)))
+    f.write(data)
+    f.flush()
+
+def _receive(f) -> bytes:
+    header = f.read(_header.size)
+    if len(header) < _header.size: raise EOFError("connection closed")
+    (n,) = _header.unpack(header)
+    data = f.read(n)
+    if len(data) < n: raise EOFError("connection closed")
+    return data
+
+##########################  Client  ##############################
+def AskParamDaemon(*, argv, environ, progName, progPath, kwargs=None, socketPath=None):
+    '''
+    Ask a running ParamDaemon to ResolveParams for us.
+    Returns (params, leftOverArgs) as ResolveParams does, or None if the daemon
+    is not running or cannot do it; the caller should then resolve in process.
+    '''
+    if socketPath is None: socketPath = DefaultSocketPath(environ)
+    if not os.path.exists(socketPath):
+        return None                 # no daemon; the usual case, and cheap.
+    if any(a in _exitingOptions for a in argv[1:]):
+        return None
+    problem = _socketDirectoryProblem(os.path.dirname(socketPath))
+    if problem is not None:
+        warning(f"ParamDaemon socket {socketPath} not used: {problem}.")
+        return None
+    try:
+        request = json.dumps({'argv': list(argv), 'environ': dict(environ), 'cwd': os.getcwd()
+                            , 'progName': progName, 'progPath': progPath, 'kwargs': kwargs or dict()})
+    except (TypeError, ValueError):
+        debug("Key word arguments can't be sent to ParamDaemon; resolving in process.")
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(ConnectTimeout)
+            s.connect(socketPath)
+            #  Whoever is listening must be us; the socket file may have been replaced after the checks above.
+            peerUid = _peerUid(s)
+            if peerUid != os.getuid():
+                warning(f"ParamDaemon socket {socketPath} is served by uid {peerUid}, not us; not used.")
+                return None
+            s.settimeout(ReplyTimeout)
+            with s.makefile('rwb') as f:
+                _send(f, request.encode())
+                reply = json.loads(_receive(f))
+            if reply['status'] != 'ok':
+                debug("ParamDaemon can't resolve this request (%s); resolving in process.", reply['reason'])
+                return None
+            params = _decode(reply['params'])
+            leftOverArgs = list(reply['leftOverArgs'])
+            messages = list(reply.get('messages') or ())
+    except (OSError, EOFError, ValueError, KeyError, TypeError) as e:
+        info(f"ParamDaemon at {socketPath} did not answer ({e!r}); resolving in process.")
+        return None
+    #  Warnings the daemon logged while resolving, as if we had resolved ourselves.
+    for m in messages:
+        logging.getLogger(m['name']).log(m['levelno'], '%s', m['message'])
+    if params is not None:
+        for (name, value) in params.items():
+            if isinstance(value, _FingerprintNames):
+                params[name] = ParamFingerprint(params, value)
+    return params, leftOverArgs
+
+##########################  Server  ##############################
+class _CaptureHandler(logging.Handler):
+    '''Keeps the WARNING and worse records one thread logs, to send to the client.'''
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.thread = threading.get_ident()
+        self.messages = list()
+
+    def emit(self, record):
+        if record.thread != self.thread: return
+        self.messages.append({'name': record.name, 'levelno': record.levelno, 'message': record.getMessage()})
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    timeout = RequestTimeout        # a client that connects and sends nothing only holds its own thread.
+
+    def handle(self):
+        try:
+            request = json.loads(_receive(self.rfile))
+        except (EOFError, ValueError, OSError) as e:
+            warning(f"Bad request to ParamDaemon: {e!r}")
+            return
+        reply = self.server.resolve(request)
+        try:
+            data = json.dumps(reply)
+        except (TypeError, ValueError) as e:
+            data = json.dumps({'status': 'fallback', 'reason': f"result can't be sent: {e}"})
+        try:
+            _send(self.wfile, data.encode())
+        except OSError:
+            pass                        # client gave up.
+
+class ParamDaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    '''
+    Serves ResolveParams requests on socketPath.  Each connection is read and answered
+    in its own thread, but requests are resolved one at a time: relative paths in them
+    are relative to the client's working directory, which is process wide.
+    '''
+    daemon_threads = True
+    def __init__(self, socketPath=None):
+        from progparams import ProgramParametersDefinitions       # not needed by clients.
+        self._ppd = ProgramParametersDefinitions
+        self._lock = threading.Lock()
+        self.socketPath = socketPath or DefaultSocketPath()
+        problem = _socketDirectoryProblem(os.path.dirname(self.socketPath), create=True)
+        if problem is not None:
+            raise PermissionError(f"ParamDaemon socket directory {os.path.dirname(self.socketPath)} is not safe: {problem}")
+        if os.path.exists(self.socketPath):
+            os.unlink(self.socketPath)      # left over from a daemon that did not shut down cleanly.
+        oldMask = os.umask(0o177)           # socket is rw for us only.
+        try:
+            super().__init__(self.socketPath, _RequestHandler)
+        finally:
+            os.umask(oldMask)
+        info(f"ParamDaemon listening on {self.socketPath}")
+
+    def resolve(self, request) -> dict:
+        '''The reply to request: its resolved parameters in JSON form, or why the client should resolve them.'''
+        with self._lock:
+            savedCwd = os.getcwd()
+            #  Warnings about the request (ignored arguments, no configuration files, ...) are for the
+            #  program's user; the client logs them again.  On fallback the program logs its own.
+            capture = _CaptureHandler()
+            logging.getLogger().addHandler(capture)
+            try:
+                os.chdir(request['cwd'])
+                params, leftOverArgs = self._ppd.ResolveParams(argv=request['argv'], environ=request['environ']
+                                                , progName=request['progName'], progPath=request['progPath']
+                                                , processIndependent=True, **request['kwargs'])
+                return {'status': 'ok', 'params': _encode(params), 'leftOverArgs': leftOverArgs
+                        , 'messages': capture.messages}
+            except SystemExit as e:         # argparse found an error; let the program report it.
+                return {'status': 'fallback', 'reason': f"exit {e.code}"}
+            except (self._ppd.ProcessDependentDefinitions, TypeError) as e:
+                debug("Request for %s left to the program: %s", request.get('progName'), e)
+                return {'status': 'fallback', 'reason': str(e)}
+            except Exception as e:
+                logger.exception("ParamDaemon could not resolve request.")
+                return {'status': 'fallback', 'reason': repr(e)}
+            finally:
+                logging.getLogger().removeHandler(capture)
+                os.chdir(savedCwd)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socketPath)
+        except OSError:
+            pass
+
+if __name__ == "__main__":
+    cl = argparse.ArgumentParser(description="Serve resolved program parameters to programs using MakeParams.")
+    cl.add_argument('--socket', help=f"Unix socket path; default {DefaultSocketPath()}")
+    clArgs = cl.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))    # so "kill" removes the socket too.
+    with ParamDaemonServer(clArgs.socket) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -17,15 +17,27 @@ Define function to put all the pieces together.
 import os               #   https://docs.python.org/3/library/os.html
 import sys              #   https://docs.python.org/3/library/sys.html
 import inspect          #   https://docs.python.org/3/library/inspect.html
+import ast              #   https://docs.python.org/3/library/ast.html
+import functools        #   https://docs.python.org/3/library/functools.html
 import json             #   https://docs.python.org/3/library/json.html
 import toml             #   https://github.com/uiri/toml    https://github.com/toml-lang/toml
 # comment json strips python and "//" comments form json before applying json.load routines.
-import commentjson      #   https://github.com/vaidik/commentjson       https://commentjson.readthedocs.io/en/latest/
+# It (with lark) is slow to import, so it is imported in LoadDefsFile when a .json/.jsonc file is read;
+# programs whose parameters come from ParamDaemon never need it.
+# import commentjson      #   https://github.com/vaidik/commentjson       https://commentjson.readthedocs.io/en/latest/
 # Lark is used by commentjson -- import commented out, but here for documentation.
 # import lark             #   https://github.com/lark-parser/lark    https://lark-parser.readthedocs.io/en/latest/
 import logging          #   https://docs.python.org/3/library/logging.html
                         #   https://github.com/keleshev/schema
 from progparams.GetLoggingDict import setConsoleLoggingLevel, setLogFileLoggingLevel, getConsoleLoggingLevel, getLogFileLoggingLevel
+from progparams.KeyWordRegistry import KeyWordRegistry
+from progparams.LazyConfig import LazyConfig
+from progparams.ConfigSources import LoadConfigSources, SourceStamp
+from progparams.ParamDaemon import AskParamDaemon
+from progparams.Fingerprint import ParamFingerprint
+from progparams.FastArgParse import FastArgumentParser
+#  Vector types are used by name in the "type" of parameter definitions (evaluated in this module).
+from progparams.VectorTypes import VectorType, IntVector, FloatVector
 
 from schema import Schema, And, Or, Use, Optional, SchemaError
 import argparse         #   https://docs.python.org/3/library/argparse.html
@@ -34,6 +46,10 @@ import configparser     #   https://docs.python.org/3/library/configparser.html
 # import time             #   https://docs.python.org/3/library/time.html
 # import datetime         #   https://docs.python.org/3/library/datetime.html
 import glob
+import re               #   https://docs.python.org/3/library/re.html
+import copy             #   https://docs.python.org/3/library/copy.html
+import threading        #   https://docs.python.org/3/library/threading.html
+from collections.abc import Mapping
 from itertools import chain
 flatten = chain.from_iterable
 
@@ -42,6 +58,8 @@ debug = logger.debug
 info = logger.info
 warning = logger.warning
 critical = logger.critical
+#  Give values to these as %-style arguments rather than f-strings so that nothing
+#  is formatted (e.g. repr of a whole paramDefs) unless the record is actually emitted.
 
 #  Defines "extend" action for argparse which was introduced in python3.8
 class ExtendAction(argparse.Action):
@@ -71,6 +89,13 @@ validArgParserKeyWords = ('dest', 'action', 'default', 'nargs', 'const', 'type',
 # Can't pickle ppds either.
 ppds = {
         Optional('ProgramDescription', default=None): str,
+        # "fast" parses the command line with FastArgumentParser; for very many parameters.
+        Optional('ArgParser', default='argparse'): And(str, lambda s: s in ('argparse', 'fast'), error='ArgParser must be "argparse" or "fast".'),
+        # Parameter definition "modules" in other files, loaded only when their group is used.
+        Optional('Includes', default=None): [{'group': str
+            , 'path': str                                       # relative to the including file
+            , Optional('active', default=False): Use(bool)      # always load this group
+            }],
         Optional('PositionalArgParserArgs', default=None): {
               'paramName': str
             , 'action': str
@@ -80,6 +105,7 @@ ppds = {
         'Parameters': [{'paramName': str
             , 'description': str
             , Optional('intermediate'): Use(bool)       # intermediate params are for defining others and will be deleted from final dictionary.
+            , Optional('affectsResults', default=False): Use(bool)     # included in the "ParamsFingerprint".
             , Optional('configName', default=None): Use(str.casefold)       # make sure all configNames are lower case.
             , Optional('default', default=None): Use(str)
             , Optional('type'): Use(str)
@@ -106,26 +132,33 @@ def GetFunctionId() -> str:
 def SetLogLevelsFromKwargs(myFunctionId, **kwargs):
     ############# Trouble is, setting console log level from here affects file logging too.
     #  Set logging level according to kwargs & cmd line options.
+    if not kwargs.get('ApplyLogLevels', True):     # ResolveParams does not touch the (global) logging handlers.
+        return
     newLogLevel = kwargs.get('BiolerPlateLoggingLevel')
-    debug(f"Computed new log level from parsed boiler plate parameters as {newLogLevel}.")
-    lls = (kwargs.get(f"{myFunctionId}.ConsoleLoggingLevel", None), kwargs.get(f"{myFunctionId}.FileLoggingLevel", None))
-    debug(f"Function ID logging levels are: {lls!r}")
+    debug("Computed new log level from parsed boiler plate parameters as %s.", newLogLevel)
+    kwr = kwargs.get('KeyWordRegistry')
+    if kwr is not None:     # Parsed once by MakeParams; just look up this function's namespace.
+        myKw = kwr.forFunction(myFunctionId)
+        lls = (myKw.get("ConsoleLoggingLevel"), myKw.get("FileLoggingLevel"))
+    else:
+        lls = (kwargs.get(f"{myFunctionId}.ConsoleLoggingLevel", None), kwargs.get(f"{myFunctionId}.FileLoggingLevel", None))
+    debug("Function ID logging levels are: %r", lls)
     llvi = int(kwargs.get('LogLevelInterval', 10))      # convenience assignment
     if (lls is not None) and (len(lls) > 0) and (lls[0] is not None):
         ll = round(int(lls[0])/llvi)*llvi        #  round to nearest multiple of LogLevelInterval
         if ll != int(lls[0]):
             logger.warning(f"Log level given: {lls[0]} is not a multiple of {llvi}, it is rounded to nearest multiple: {ll}")
         setConsoleLoggingLevel(ll)
-        debug(f'Console logging level set to {ll} from cmd line "KeyWordParams"')
+        debug('Console logging level set to %s from cmd line "KeyWordParams"', ll)
     elif newLogLevel is not None:
-        debug(f'Console logging {newLogLevel} from -v,-q cmd line options.')
+        debug('Console logging %s from -v,-q cmd line options.', newLogLevel)
         setConsoleLoggingLevel(newLogLevel)
     if (lls is not None) and (len(lls) > 1) and (lls[1] is not None):
         ll = round(int(lls[1])/llvi)*llvi        #  round to nearest multiple of LogLevelInterval
         if ll != int(lls[1]):
             warning(f"Log level given: {lls[1]} is not a multiple of {llvi}, it is rounded to nearest multiple: {ll}")
         setLogFileLoggingLevel(ll)
-        debug(f"File logging level set to {ll}")
+        debug("File logging level set to %s", ll)
 
 # ppds = [{'paramName': str
 #         , 'description': str
@@ -179,6 +212,15 @@ nargs = "*"
 type = "str"
 help = "Give multiple times to make a list of key word arguments to pass to functions in the program."
 
+[[BoilerPlateArgParserArgs]]
+paramName = "ParamGroups"
+dest = "ParamGroups"
+long = "--ParamGroups"
+action = "extend"
+nargs = "+"
+type = "str"
+help = "Give multiple times to make a list of included parameter groups to load with the main parameters."
+
 # logger.setLevel(DefaultLoggingLevel - Verbosity*LogLevelInterval + Quietude*LogLevelInterval)
 [[BoilerPlateArgParserArgs]]
 paramName = "DefaultLoggingLevel"
@@ -245,12 +287,13 @@ def addBoilerPlateArgs(parser, **kwargs):
     try:
 
         myFunctionId = GetFunctionId()
-        debug(f'In GetParams, my "ID" is {myFunctionId}')
+        debug('In GetParams, my "ID" is %s', myFunctionId)
         SetLogLevelsFromKwargs(myFunctionId, **kwargs)
 
         for a in BoilerPlateArgs:
+            a = dict(a)     # work on a copy; BoilerPlateArgs is shared by every caller (and thread).
             paramName = a.get('paramName')
-            debug(f"Adding '{paramName}' to argparse")
+            debug("Adding '%s' to argparse", paramName)
             #  Guarantee at least one of these.
             if (a.get('short') is None) and (a.get('long')  is None):
                 critical(f'One of argParserArgs options in "short" or "long" form must be present and not None: {a!r}')
@@ -273,10 +316,10 @@ def addBoilerPlateArgs(parser, **kwargs):
             ## put together the whole add_argument call
             cmdArg = ', '.join(cmdArg)
             arg = addArg.format(cmdArg=cmdArg, paramName=paramName)
-            debug(f'exec({arg})')
+            debug('exec(%s)', arg)
             try:
                 exec(arg)
-                logger.debug(f'Successfully added command line argument option for "{paramName}""')
+                logger.debug('Successfully added command line argument option for "%s""', paramName)
             except Exception as e:
                 logger.warning(f"Trying to add arg had an exception: {e}")
                 pass
@@ -285,8 +328,23 @@ def addBoilerPlateArgs(parser, **kwargs):
         # setLogFileLoggingLevel(fileLogLevel)
         pass
 
+##########################  File caches  ##############################
+#  Parsed files are kept and reused until the file's modification time or size changes.
+_fileCacheLock = threading.Lock()
+_defsFileCache = dict()         # real path -> ((st_mtime_ns, st_size), parsed definitions)
+_configCache = dict()           # ((config path, stamp), ...), sections) -> (configparser, files used)
+_configCacheSize = 64
+
+def _fileStamp(path):
+    '''Return (st_mtime_ns, st_size) of path, or None if it cannot be stat'ed.'''
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 ##########################  GetConfig  ##############################
-def GetConfig(**kwargs):
+def GetConfig(*, argv=None, environ=None, progName=None, progPath=None, configNames=None, **kwargs):
     '''A dictionary with contents of ".ini" file(s) using sections related to
 the calling program is used to load values into options that may be overridden
 by command line arguments.
@@ -295,7 +353,9 @@ Keyword args to the main program as well as the command line options
 referenced above affect this behavior:
     configPaths = a list of "glob" paths to files that will be read.
                     Any files that do not exist or don't parse ok will
-                    be ignored.  Defaults as below.
+                    be ignored.  Defaults as below.  Files ending in
+                    .sqlite, .sqlite3 or .db are SQLite configuration
+                    stores (see ConfigSources).
     configSections = a list of sections in the .ini file(s) from which
                     to load values.  Last section with an option in it
                     overrides previous definitions.  Defaults as below.
@@ -309,14 +369,26 @@ DEFAULT CONFIG SECTIONS (in order; later sections overriding earlier ones):
     [<program name>]     including extension, typically ".py"
     [<program name>/<"LOCATION" environment variable>]
     [<program name>/<"HOST" environment variable>]
+
+The program name and path, the command line (for the program name with extension)
+and the environment may be given with the argv, environ, progName and progPath
+keywords; they default to sys.argv, os.environ, ProgName and ProgPath.
+
+The returned mapping is a LazyConfig: an option is interpolated only when it is
+looked up.  If configNames (an iterable of option names) is given, only those
+options are visible.
 '''
+    if argv is None: argv = sys.argv
+    if environ is None: environ = os.environ
+    if progName is None: progName = ProgName
+    if progPath is None: progPath = ProgPath
     consoleLogLevel = getConsoleLoggingLevel()
     fileLogLevel = getLogFileLoggingLevel()
 ########## Put this whole function in a try ... finally block so we can restore log levels on exit.
     try:
 
         myFunctionId = GetFunctionId()
-        debug(f'In GetParams, my "ID" is {myFunctionId}')
+        debug('In GetParams, my "ID" is %s', myFunctionId)
         SetLogLevelsFromKwargs(myFunctionId, **kwargs)
 
         # Pick up configPaths from kwargs or default.
@@ -325,7 +397,7 @@ DEFAULT CONFIG SECTIONS (in order; later sections overriding earlier ones):
             if isinstance(fns, str): fns = (fns,)
         else:
             # Look for .ini files with our program name in the program dir, then in location given by environment variable.
-            fns = (os.path.join(ProgPath, ProgName+'*.ini'), os.environ.get('PrivateConfig'))
+            fns = (os.path.join(progPath, progName+'*.ini'), environ.get('PrivateConfig'))
         # Make a list of actual files to read.
         configPaths = list(flatten([glob.glob(x) for x in fns if x is not None]))
 
@@ -334,36 +406,48 @@ DEFAULT CONFIG SECTIONS (in order; later sections overriding earlier ones):
             cfgSections = kwargs['configSections']
             if isinstance(cfgSections, str): cfgSections = (cfgSections,)
         else:
-            host = os.environ.get('HOST', 'Unknown')    # DON'T want None
+            host = environ.get('HOST', 'Unknown')    # DON'T want None
                 #  location is usually the same as first two of host
-            loc = os.environ.get('LOCATION', host[0:2])
-            progName = os.path.basename(sys.argv[0])
+            loc = environ.get('LOCATION', host[0:2])
+            progFullName = os.path.basename(argv[0])
                 #  os.path.join is too smart; my .ini file sections happen to
                 #  have "/" separators, not necessarily file path separators.
-            cfgSections =   ( loc                # LOCATION
-                            , host               # HOST
-                            , progName           # program name
-                            , progName+"/"+loc   # prog name & LOCATION
-                            , progName+"/"+host  # prog name & HOST
+            cfgSections =   ( loc                    # LOCATION
+                            , host                   # HOST
+                            , progFullName           # program name
+                            , progFullName+"/"+loc   # prog name & LOCATION
+                            , progFullName+"/"+host  # prog name & HOST
                             )
 
-        #  This configparser lower cases all option names.  For consistency sake,
-        #  only use lower case option names in .ini file.
-        config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
         cfgDict = dict()        # empty dict
-
-        cfgFilesUsed = config.read(configPaths) # reads all configPaths, returns ones used.
-        debug(f'Used configuration file(s) at: {cfgFilesUsed}')
+        #  A process that resolves parameters repeatedly (e.g. ParamDaemon) reuses the
+        #  configparser while none of its files has changed.
+        cacheKey = (tuple((fn, SourceStamp(fn)) for fn in configPaths), tuple(cfgSections))
+        cached = _configCache.get(cacheKey)
+        if cached is not None:
+            config, cfgFilesUsed = cached
+        else:
+            #  This configparser lower cases all option names.  For consistency sake,
+            #  only use lower case option names in .ini file.
+            config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
+
+            #  Reads all configPaths, each with the backend for its kind (see ConfigSources),
+            #  returns ones used.  Only DEFAULT, cfgSections and the sections they reference
+            #  for interpolation are loaded; others are skipped.
+            cfgFilesUsed = LoadConfigSources(config, configPaths, cfgSections)
+            with _fileCacheLock:
+                while len(_configCache) >= _configCacheSize:
+                    _configCache.pop(next(iter(_configCache)))      # forget the oldest
+                _configCache[cacheKey] = (config, cfgFilesUsed)
+        debug('Used configuration file(s) at: %s', cfgFilesUsed)
         if len(cfgFilesUsed) == 0: warning(f"\n\n!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!\n!!    NO configuration files read     !!\n!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!\n")
         if len(config) == 0:        # nothing loaded into config (which looks like a dict)
             warning(f"EMPTY config info dict read from .ini files.")
             return cfgDict          # return empty dict
 
-        for cfgSection in cfgSections:
-            if cfgSection in config:
-                debug(f"Reading INI file section: {cfgSection}")
-                cfg = config[cfgSection]        # saved as variable so could print in debugging
-                cfgDict = {**cfgDict, **cfg}    # Puts both dictionaries into one, second overriding
+        #  Later sections override earlier ones; options are only interpolated when looked up.
+        cfgDict = LazyConfig(config, cfgSections, names=configNames)
+        debug("Reading INI file sections: %s", cfgDict.sections)
         return cfgDict
     finally:        # Restore logging levels to what they were when we began.
         # setConsoleLoggingLevel(consoleLogLevel)
@@ -371,15 +455,17 @@ DEFAULT CONFIG SECTIONS (in order; later sections overriding earlier ones):
         pass
 
 ##########################  GetParams  ##############################
-def GetParams(*args, **kwargs):
+def GetParams(*args, progName=None, progPath=None, **kwargs):
+    if progName is None: progName = ProgName
+    if progPath is None: progPath = ProgPath
     consoleLogLevel = getConsoleLoggingLevel()
     fileLogLevel = getLogFileLoggingLevel()
-    debug(f"Saved log levels are console: {consoleLogLevel}, file: {fileLogLevel}")
+    debug("Saved log levels are console: %s, file: %s", consoleLogLevel, fileLogLevel)
 ########## Put this whole function in a try ... finally block so we can restore log levels on exit.
     try:
 
         myFunctionId = GetFunctionId()
-        debug(f'In GetParams, my "ID" is {myFunctionId}')
+        debug('In GetParams, my "ID" is %s', myFunctionId)
         SetLogLevelsFromKwargs(myFunctionId, **kwargs)
 
         if kwargs.get('ParamPath') is not None:
@@ -387,33 +473,29 @@ def GetParams(*args, **kwargs):
             if isinstance(fns, str): fns = (fns,)
         else:
             # Look for .jsonc and .json files with our program name in the main program's dir then in cwd.
-            fns = [   os.path.join(ProgPath, ProgName+'*Params.toml')
-                    , os.path.join(ProgPath, ProgName+'*Params.jsonc')
-                    , os.path.join(ProgPath, ProgName+'*Params.json')
-                    , f"{ProgName}*Params.toml"
-                    , f"{ProgName}*Params.jsonc"
-                    , f"{ProgName}*Params.json"
+            fns = [   os.path.join(progPath, progName+'*Params.toml')
+                    , os.path.join(progPath, progName+'*Params.jsonc')
+                    , os.path.join(progPath, progName+'*Params.json')
+                    , f"{progName}*Params.toml"
+                    , f"{progName}*Params.jsonc"
+                    , f"{progName}*Params.json"
                 ]
-            debug(f"Looking for parameter definition file in default locations:  {fns}")
+            debug("Looking for parameter definition file in default locations:  %s", fns)
         # glob process param paths
         # Make a list of actual files to read.
         fns = list(flatten([glob.glob(x) for x in fns]))
         # debug(f"Looking for parameter definition file in GLOBBED locations:  {fns}")
 
-        debug(f"Looking for first good JSON or TOML parameters file in GLOBBED locations: {fns!r}")
+        debug("Looking for first good JSON or TOML parameters file in GLOBBED locations: %r", fns)
         if fns is None: return None, None     # no paramDefs, and no files to read it from.
         for fn in fns:
             try:
-                debug(f"Trying to load parameters from file: {fn}")
-                fnExt = os.path.splitext(fn)[1]
-                if fnExt == ".json" or fnExt == ".jsonc":
-                    paramDefs = commentjson.load(open(fn))
-                elif fnExt == ".toml":
-                    paramDefs = toml.load(fn)
-                else:
-                    critical(f"Unrecognized file type from which to load parameters: {fnExt}")
+                debug("Trying to load parameters from file: %s", fn)
+                paramDefs = LoadDefsFile(fn)
+                if paramDefs is None:
+                    critical(f"Unrecognized file type from which to load parameters: {os.path.splitext(fn)[1]}")
                     return None, fn
-                debug(f"Successfully loaded paramDefs: {paramDefs}\n\nFrom file {fn}")
+                debug('Successfully loaded paramDefs: %s\n\nFrom file %s', paramDefs, fn)
                 break       #  exit the for loop without doing the else clause.
             except json.JSONDecodeError as e:
                 info(f"Json file: {fn} did not load successfully: {e}")
@@ -428,7 +510,7 @@ def GetParams(*args, **kwargs):
     finally:        # Restore logging levels to what they were when we began.
         # setConsoleLoggingLevel(consoleLogLevel)
         # setLogFileLoggingLevel(fileLogLevel)
-        debug(f"Restored log levels are console: {consoleLogLevel}, file: {fileLogLevel}")
+        debug("Restored log levels are console: %s, file: %s", consoleLogLevel, fileLogLevel)
         pass
 
 '''
@@ -444,6 +526,173 @@ the list items returned by a.items().  x[0] is the key part, and x[1] is the val
 I think the first form is much more understandable.
 '''
 
+##########################  LoadDefsFile  ##############################
+def LoadDefsFile(fn):
+    '''Load a .toml, .jsonc or .json parameter definitions file; None if the extension is not one of those.
+    The parsed file is cached; each call returns its own copy.'''
+    fnExt = os.path.splitext(fn)[1]
+    if fnExt not in (".json", ".jsonc", ".toml"):
+        return None
+    path = os.path.realpath(fn)
+    stamp = _fileStamp(path)
+    cached = _defsFileCache.get(path)
+    if (cached is None) or (cached[0] != stamp) or (stamp is None):
+        if fnExt == ".json" or fnExt == ".jsonc":
+            import commentjson
+            with open(fn) as f:
+                defs = commentjson.load(f)
+        else:
+            defs = toml.load(fn)
+        cached = (stamp, defs)
+        with _fileCacheLock:
+            _defsFileCache[path] = cached
+    return copy.deepcopy(cached[1])
+
+##########################  Included parameter modules  ##############################
+_negativeNumber = re.compile(r'^-\d+$|^-\d*\.\d+$')     # as argparse: a value, not an option
+'''
+A parameter definitions file may include other definition files ("modules"), each
+with its own "Parameters" list, under a group name:
+
+    [[Includes]]                            "Includes": [
+    group = "db"                                { "group": "db", "path": "myProgDbParams.toml" }
+    path = "myProgDbParams.toml"            ]
+
+A module is read, validated and added to the argument parser only when its group
+is active -- named by --ParamGroups (or the ParamGroups key word argument), or
+marked "active = true" -- or when the program first looks it up in the
+"ParamModules" entry of the parameters dictionary:
+
+    params['ParamModules']['db']['dbHost']
+
+Validated modules are cached by file, and re-read only if the file changes.
+"Includes" in a module file are not followed.  Don't name module files so that they
+match the default "<ProgName>*Params.*" search, or GetParams may pick one as the main file.
+When there are included groups, unused command line arguments are not warned about,
+since they may belong to a group that has not been loaded.
+'''
+_paramModuleCache = dict()      # real path -> ((st_mtime_ns, st_size), validated definitions)
+
+def LoadParamModule(path, *args, **kwargs):
+    '''Return a private copy of the validated definitions in module file "path", or None.
+    Also used for the main definitions file, so a process resolving parameters
+    repeatedly validates each file only once.'''
+    path = os.path.realpath(path)
+    stamp = _fileStamp(path)
+    if stamp is None:
+        warning(f"Parameter definitions file {path} cannot be read.")
+        return None
+    cached = _paramModuleCache.get(path)
+    if (cached is None) or (cached[0] != stamp):
+        debug("Loading parameter module %s", path)
+        try:
+            moduleDefs = LoadDefsFile(path)
+        except (json.JSONDecodeError, toml.TomlDecodeError, OSError, ValueError) as e:
+            warning(f"Parameter module {path} did not load successfully: {e}")
+            return None
+        if moduleDefs is None:
+            critical(f"Unrecognized file type from which to load parameters: {path}")
+            return None
+        moduleDefs = ValidateParamDefs(moduleDefs, *args, **kwargs)
+        if moduleDefs is None: return None
+        cached = (stamp, moduleDefs)
+        with _fileCacheLock:
+            _paramModuleCache[path] = cached
+    #  createParams edits the argParserArgs it is given; keep the cached copy clean.
+    return copy.deepcopy(cached[1])
+
+class ParamModules(Mapping):
+    '''
+    The included parameter groups of a parameter definitions dictionary, by group name.
+    Looking up a group that was not active when the parameters were created loads,
+    validates and creates its parameters then (from the command line arguments the
+    main parameters did not use), and remembers them.
+    '''
+    def __init__(self, includes, baseDir, activeGroups=()):
+        self._includes = dict()         # group -> absolute path of its module file
+        self._active = set()
+        for inc in includes:
+            self._includes[inc['group']] = os.path.join(baseDir, os.path.expanduser(inc['path']))
+            if inc.get('active'): self._active.add(inc['group'])
+        for g in activeGroups or ():
+            if g in self._includes: self._active.add(g)
+            else: warning(f'Parameter group "{g}" is not included by the parameter definitions; ignored.')
+        self._names = dict()            # active group -> its parameter names
+        self._params = dict()           # group -> dict of created parameters
+        self._lock = threading.Lock()
+        self._args = tuple()
+        self._kwargs = dict()           # createParams arguments for groups loaded on first access.
+
+    def activeParameters(self, *args, **kwargs):
+        '''Return the (validated) parameter definitions of the active groups, to add to the main ones.'''
+        params = list()
+        for group in self._includes:
+            if group not in self._active: continue
+            moduleDefs = LoadParamModule(self._includes[group], *args, **kwargs)
+            if moduleDefs is None: continue
+            self._names[group] = [p['paramName'] for p in moduleDefs['Parameters']]
+            params.extend(moduleDefs['Parameters'])
+        return params
+
+    def bind(self, createdParams, *args, **kwargs):
+        '''Record the main created parameters and how to create the rest on first access.'''
+        for (group, names) in self._names.items():
+            self._params[group] = {n: createdParams.get(n) for n in names}
+        self._args = args
+        self._kwargs = kwargs
+
+    @property
+    def activeGroups(self):
+        return frozenset(self._active)
+
+    def unknownOptions(self, unusedArgs):
+        '''
+        The arguments in unusedArgs that look like options but are no option (or
+        abbreviation of one) of any included group: misspellings, most likely.
+        Only the groups' definition files are read (cached), not their parameters created.
+        '''
+        optionStrings = set()
+        for path in self._includes.values():
+            try:
+                moduleDefs = LoadDefsFile(path) or dict()
+            except (json.JSONDecodeError, toml.TomlDecodeError, OSError, ValueError):
+                continue        # reported when the group is loaded
+            for p in moduleDefs.get('Parameters') or ():
+                a = p.get('argParserArgs') or dict()
+                optionStrings.update(o for o in (a.get('short'), a.get('long')) if o is not None)
+        unknown = list()
+        for arg in unusedArgs:
+            if (len(arg) < 2) or (arg[0] != '-') or (arg == '--') or _negativeNumber.match(arg): continue
+            option = arg.split('=', 1)[0]
+            if arg[1] != '-' and (arg[:2] in optionStrings): continue          # -xVALUE
+            if any(o.startswith(option) for o in optionStrings): continue       # exact or abbreviated
+            unknown.append(arg)
+        return unknown
+
+    def __getitem__(self, group):
+        if group not in self._includes: raise KeyError(group)
+        params = self._params.get(group)
+        if params is None:
+            with self._lock:
+                params = self._params.get(group)
+                if params is None:
+                    debug("First access to parameter group %s; loading it now.", group)
+                    moduleDefs = LoadParamModule(self._includes[group], *self._args, **self._kwargs)
+                    if moduleDefs is None: raise KeyError(group)
+                    #  The main parser already reported the arguments it did not use.
+                    params = createParams(moduleDefs, *self._args, leftOverArgs=list(), **self._kwargs)
+                    self._params[group] = params
+        return params
+
+    def __iter__(self):
+        return iter(self._includes)
+
+    def __len__(self):
+        return len(self._includes)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(groups={list(self._includes)!r}, loaded={list(self._params)!r})"
+
 ##########################  MakeParams  ##############################
 def MakeParams(*args, **kwargs):        # args is a list of non-keyword arguments; kwargs is a dict of keyword args.
     '''Top level function to create a dictionary of parameters from a JSON params file and .ini files.
@@ -469,7 +718,9 @@ Get a couple command line arguments before proceeding:
     around the "=", and if whitespace in the value, single quote it.  Functions
     are expected to look for key-word arguments that start with the function name.
     I anticipate using this capability to have fine-grained control over the
-    logging output.
+    logging output.  The items are parsed once into a KeyWordRegistry, returned
+    under the key "KeyWordRegistry", whose forFunction(<function ID>) gives a
+    function its own typed key-word values with one dict lookup.
 
 --DefaultLoggingLevel is an integer logging level to set as the default; should be
     one of the values from https://docs.python.org/3/library/logging.html#logging-levels .
@@ -499,123 +750,262 @@ Get a couple command line arguments before proceeding:
                             will evaluate them and pass them as key word parameters to any other functions called.
     ProgramDocString    => Additional documentation to include in the help message.
 '''
-    consoleLogLevel = getConsoleLoggingLevel()
-    fileLogLevel = getLogFileLoggingLevel()
-########## Put this whole function in a try ... finally block so we can restore log levels on exit.
+    if kwargs.get('loggingLevel') is not None:
+        debug("In MakeParams, setting log level to %s from kwargs.", kwargs.get('loggingLevel'))
+        setConsoleLoggingLevel(kwargs.get('loggingLevel'))
+
+    myFunctionId = GetFunctionId()
+    debug('In MakeParams, my "ID" is %s', myFunctionId)
+
+    ## A running ParamDaemon has everything cached; ask it first.
+    resolved = None
+    if len(args) == 0:
+        resolved = AskParamDaemon(argv=sys.argv, environ=os.environ, progName=ProgName, progPath=ProgPath, kwargs=kwargs)
+    if resolved is not None:
+        paramDefs, leftOverArgs = resolved
+        if paramDefs is not None:
+            ## The daemon doesn't touch our logging; set levels from -v, -q and KeyWordParams here.
+            logKwargs = {'LogLevelInterval': 10, 'KeyWordRegistry': paramDefs.get('KeyWordRegistry')}
+            if (int(paramDefs['Quietude']) != 0) or (int(paramDefs['Verbosity']) != 0):
+                logKwargs['BiolerPlateLoggingLevel'] = int(paramDefs['DefaultLoggingLevel']) \
+                        + (int(paramDefs['Quietude']) - int(paramDefs['Verbosity'])) * logKwargs['LogLevelInterval']
+            SetLogLevelsFromKwargs(myFunctionId, **logKwargs)
+    else:
+        paramDefs, leftOverArgs = ResolveParams(*args, argv=sys.argv, environ=os.environ
+                                                , progName=ProgName, progPath=ProgPath
+                                                , applyLogLevels=True, functionId=myFunctionId, **kwargs)
+    ## Re-create sys.argv without the options that we have already processed.
+    ## This will prevent errors if later command line processing doesn't recognize them.
+    ## It is a good idea to include these options in whichever command line processor gives help
+    ## so the help text will describe them.
+    TempPath = [sys.argv[0], ]      # get the first argument to program, the program path
+    TempPath.extend(leftOverArgs)   # put all the left overs on the end.
+    sys.argv = TempPath             # Recreate sys.argv, without the ones we may have captured.
+    return paramDefs
+
+##########################  Process independent definitions  ##############################
+#  Names whose values are the same in every process, for expressions in definitions
+#  (besides "cfg" and the parameters defined before the expression).
+_processIndependentNames = frozenset(('True', 'False', 'None', 'int', 'float', 'complex', 'str', 'bytes', 'bool'
+                , 'list', 'tuple', 'dict', 'set', 'frozenset', 'range', 'len', 'min', 'max', 'abs', 'round'
+                , 'sum', 'sorted', 'reversed', 'enumerate', 'zip', 'map', 'filter', 'any', 'all', 'divmod'
+                , 'pow', 'chr', 'ord', 'hex', 'oct', 'bin', 'repr', 'format', 'isinstance'
+                , 'VectorType', 'IntVector', 'FloatVector'))
+
+class ProcessDependentDefinitions(ValueError):
+    '''Parameter definitions whose values depend on the process that resolves them.'''
+
+@functools.lru_cache(maxsize=4096)
+def _freeNames(expr):
+    '''The names expr reads and does not bind itself (lambda arguments, comprehension
+    variables), or None if expr is not an expression.'''
     try:
-        if kwargs.get('loggingLevel') is not None:
-            debug(f"In MakeParams, setting log level to {kwargs.get('loggingLevel')} from kwargs.")
-            setConsoleLoggingLevel(kwargs.get('loggingLevel'))
-
-        myFunctionId = GetFunctionId()
-        debug(f'In MakeParams, my "ID" is {myFunctionId}')
-
-        debug(f"kwargs is {kwargs}; add them to sys.argv: {sys.argv}")
-        for k,v in kwargs.items():
-            found = False
-            for a in sys.argv:
-                found |= a.startswith(f"--{k}")
-            if not found:
-                sys.argv.extend((f'--{k}={v}',))
-        debug(f"After adding kwargs to sys.argv: {sys.argv}")
+        tree = ast.parse(expr.strip(), mode='eval')
+    except SyntaxError:
+        return None
+    nodes = list(ast.walk(tree))
+    bound = {n.arg for n in nodes if isinstance(n, ast.arg)} \
+            | {n.id for n in nodes if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)}
+    return frozenset(n.id for n in nodes if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)) - bound
+
+def ProcessDependentExpressions(paramDefs) -> list:
+    '''
+    The expressions of validated paramDefs (a parameter's type, or its default when it
+    has no type, and argParserArgs type and required) that read anything but builtins
+    and vector types that are the same in every process, "cfg", and parameters defined
+    before them.  Their values may depend on the process evaluating them (os.environ,
+    sys.argv, ProgName, the time, ...).
+    '''
+    known = set(_processIndependentNames) | {'cfg'}
+    found = list()
+    for p in paramDefs.get('Parameters') or ():
+        expressions = [('type', p.get('type'))] if p.get('type') is not None else [('default', p.get('default'))]
+        a = p.get('argParserArgs') or dict()
+        expressions.extend((f'argParserArgs.{k}', a.get(k)) for k in nonStringParserKeyWords)
+        for (key, expr) in expressions:
+            if expr is None: continue
+            names = _freeNames(str(expr))
+            if (names is None) or not names.issubset(known):
+                found.append(f"{p['paramName']}.{key} = {expr}")
+        known.add(p['paramName'])
+    return found
+
+##########################  ResolveParams  ##############################
+def ResolveParams(*args, argv, environ=None, progName=None, progPath=None
+                    , applyLogLevels=False, functionId=None, processIndependent=False, **kwargs):
+    '''The work of MakeParams without touching any global state.
 
-        parser = argparse.ArgumentParser(add_help=False)
+    Parameters:
+        argv            required: the command line, including the program path as argv[0].
+                        It is not modified.
+        environ         optional: mapping used for HOST, LOCATION and PrivateConfig;
+                        defaults to an empty dict (NOT os.environ).
+        progName        optional: program name without extension; defaults to the
+                        base name of argv[0] without its extension.
+        progPath        optional: directory searched for parameter and .ini files;
+                        defaults to the directory of argv[0].
+        applyLogLevels  optional: if True, set the console and file logging levels from
+                        -v, -q and KeyWordParams the way MakeParams does.  Logging
+                        handlers are process wide, so leave it False when resolving
+                        concurrently.
+        functionId      optional: the function ID whose KeyWordParams logging levels
+                        apply to this call; defaults to this function's ID.
+        processIndependent  optional: if True, raise ProcessDependentDefinitions, before
+                        any parameter is created, when the result would depend on the process
+                        resolving it rather than on argv, environ and the files read: the
+                        definitions include parameter groups (loaded later, in the caller's
+                        process), or have ProcessDependentExpressions.  For ParamDaemon.
+        kwargs          as for MakeParams.
+
+    Returns a tuple of (parameters dictionary or None, list of command line arguments
+    not consumed by the boiler plate options).
+
+    Each call works on its own copies of argv and kwargs, so ResolveParams may be
+    called repeatedly, or from several threads at once, e.g. one per tenant.
+    '''
+    if environ is None: environ = dict()
+    if progName is None: progName = os.path.splitext(os.path.basename(argv[0]))[0]
+    if progPath is None: progPath = os.path.dirname(os.path.realpath(argv[0]))
+    myFunctionId = functionId if functionId is not None else GetFunctionId()
+    debug('In ResolveParams, my "ID" is %s', myFunctionId)
+
+    ## Key word arguments not already given on the command line are processed as if they were.
+    argv = list(argv)
+    debug("kwargs is %s; add them to argv: %s", kwargs, argv)
+    for k,v in kwargs.items():
+        found = False
+        for a in argv:
+            found |= a.startswith(f"--{k}")
+        if not found:
+            argv.append(f'--{k}={v}')
+    debug("After adding kwargs to argv: %s", argv)
+    kwargs = dict(kwargs)       # the values below are for us and the functions we call, not the caller.
+    kwargs['ApplyLogLevels'] = applyLogLevels
+
+    parser = argparse.ArgumentParser(add_help=False)
+
+    if sys.version_info < (3,8):
+        parser.register('action', 'extend', ExtendAction)
 
-        if sys.version_info < (3,8):
-            parser.register('action', 'extend', ExtendAction)
+    '''
+    When using these optional command line args, if you use the <option>=<value> form,
+    you can have only one value for that option (you can have multipel of these options however).
+    If you use the <option> <value> form, you can have multiple values for the option, like:
+    <option> <value> <value> ... <value> <next option>.
+    Note that the shell removes quotes around values so argv gets a list of quoted strings;
+    argparse processes the "=" form such that all the string past the "=" is the value including
+    any spaces that were quoted on the command line.
+    '''
 
-        '''
-        When using these optional command line args, if you use the <option>=<value> form,
-        you can have only one value for that option (you can have multipel of these options however).
-        If you use the <option> <value> form, you can have multiple values for the option, like:
-        <option> <value> <value> ... <value> <next option>.
-        Note that the shell removes quotes around values so argv gets a list of quoted strings;
-        argparse processes the "=" form such that all the string past the "=" is the value including
-        any spaces that were quoted on the command line.
-        '''
+    addBoilerPlateArgs(parser, ApplyLogLevels=applyLogLevels)
+    # Done again because addBoilerPlateArgs may have changed logging levels
+    if applyLogLevels and (kwargs.get('loggingLevel') is not None):
+        setConsoleLoggingLevel(kwargs.get('loggingLevel'))
 
-        addBoilerPlateArgs(parser)
-        # Done again because addBoilerPlateArgs may have changed logging levels
-        if kwargs.get('loggingLevel') is not None:
-            setConsoleLoggingLevel(kwargs.get('loggingLevel'))
-
-
-        cmdArgs, leftOverArgs = parser.parse_known_args()      # get these config options
-        argVars = vars(cmdArgs)        #  This gives dictionary access to cmdArgs which is a Namespace.
-        debug(f"The BoilerPlateArgs options are: {cmdArgs}")
-        kwargs['LogLevelInterval'] = 10            # Not modifiable but eventually passed thru kwargs
-        debug(f"The (so far) unprocessed command line options are: {leftOverArgs}")
-        ## Re-create sys.argv without the options that we have already processed.
-        ## This will prevent errors if later command line processing doesn't recognize them.
-        ## It is a good idea to include these options in whichever command line processor gives help
-        ## so the help text will describe them.
-        TempPath = [sys.argv[0], ]      # get the first argument to program, the program path
-        TempPath.extend(leftOverArgs)   # put all the left overs on the end.
-        sys.argv = TempPath             # Recreate sys.argv, without the ones we may have captured.
+    cmdArgs, leftOverArgs = parser.parse_known_args(argv[1:])      # get these config options
+    argVars = vars(cmdArgs)        #  This gives dictionary access to cmdArgs which is a Namespace.
+    debug("The BoilerPlateArgs options are: %s", cmdArgs)
+    kwargs['LogLevelInterval'] = 10            # Not modifiable but eventually passed thru kwargs
+    debug("The (so far) unprocessed command line options are: %s", leftOverArgs)
+    ## The rest of the processing sees the command line without the options already processed.
+    argv = [argv[0], ] + leftOverArgs
 
 #####---------   Put boiler plate KeyWordParams into kwargs dictionary
-        kwp = argVars.get('KeyWordParams')
-        debug(f"KeyWordParams from command line are: {kwp}")
-        if kwp is not None:
-            for kwDef in kwp:
-                # debug(f"key word def is {kwDef}")
-                kwDefParts = kwDef.split("=", maxsplit=1)
-                # debug(f"Key word parts are {kwDefParts!r}")
-                if len(kwDefParts) < 2: continue    # don't try to do anything if it doesn't have an "="".
-                kwargs[f"{kwDefParts[0]}"]= kwDefParts[1]
-                debug(f"Created new kwarg: kwargs[{kwDefParts[0]!r}] = {kwDefParts[1]}")
-
-
-        # Set logging levels for this function from command line KeyWordParams:
-        #   ProgramParametersDefinitions.MakeParams.ConsoleLoggingLevel     and
-        #   ProgramParametersDefinitions.MakeParams.FileLoggingLevel
-        #           ---   or   ---
-        # from boiler plate verbosity options -v and -q
-        if (int(argVars['Quietude']) != 0) or (int(argVars['Verbosity']) != 0):
-            newLogLevel = int(argVars['DefaultLoggingLevel']) + (int(argVars['Quietude']) - int(argVars['Verbosity'])) * kwargs['LogLevelInterval']
-            kwargs['BiolerPlateLoggingLevel'] = newLogLevel
-        SetLogLevelsFromKwargs(myFunctionId, **kwargs)  # Trouble is, setting console log level from here affects file logging too.
-
-        paramFile = "from kwargs['paramDefs']"      # A string describing the source, in this case, not a file name.
-        paramDefs = kwargs.get('paramDefs')
-        if paramDefs is None:   # Only go read the file if we didn't get paramDefs as a keyword argument
-            paramDefs, paramFile = GetParams(*args, **kwargs)   # GetParams returns a dictionary and the file from which it was read.
-            SetLogLevelsFromKwargs(myFunctionId, **kwargs)
-            debug(f'Read parameter definitions from file "{paramFile}" and got\n{paramDefs}')
-        if (paramDefs is None) or (len(paramDefs) == 0):
-            critical(f"We have no parameter definitions; just quit now.")
-            return None
-
-        paramDefs = ValidateParamDefs(paramDefs, *args, **kwargs)    # returns None if invalid
-        SetLogLevelsFromKwargs(myFunctionId, **kwargs)
-        debug(f'Validated paramDefs is {paramDefs!r}\n')
-        paramDefs = createParams(paramDefs, *args, **kwargs)  #  CreateParams returns None if given None
+    kwp = argVars.get('KeyWordParams')
+    debug("KeyWordParams from command line are: %s", kwp)
+    ## Parse them once into a registry indexed by function ID; functions look up
+    ## their own namespace with KeyWordRegistry.forFunction(GetFunctionId()).
+    ## "<function ID>.<keyword>" kwargs given by the caller go in first, so the command line overrides them.
+    kwr = KeyWordRegistry(f"{k}={v}" for (k, v) in kwargs.items() if '.' in k)
+    kwargs['KeyWordRegistry'] = kwr
+    if kwp:
+        cmdKwr = KeyWordRegistry(kwp)
+        kwr.update(f"{k}={v}" for (k, v) in cmdKwr.asKwargs().items())
+        ## The command line "<function ID>.<keyword>" strings also go into kwargs as before for existing callers.
+        kwargs.update(cmdKwr.asKwargs())
+
+
+    # Set logging levels for this function from command line KeyWordParams:
+    #   ProgramParametersDefinitions.MakeParams.ConsoleLoggingLevel     and
+    #   ProgramParametersDefinitions.MakeParams.FileLoggingLevel
+    #           ---   or   ---
+    # from boiler plate verbosity options -v and -q
+    if (int(argVars['Quietude']) != 0) or (int(argVars['Verbosity']) != 0):
+        newLogLevel = int(argVars['DefaultLoggingLevel']) + (int(argVars['Quietude']) - int(argVars['Verbosity'])) * kwargs['LogLevelInterval']
+        kwargs['BiolerPlateLoggingLevel'] = newLogLevel
+    SetLogLevelsFromKwargs(myFunctionId, **kwargs)  # Trouble is, setting console log level from here affects file logging too.
+
+    paramFile = "from kwargs['paramDefs']"      # A string describing the source, in this case, not a file name.
+    paramDefs = kwargs.get('paramDefs')
+    if paramDefs is None:   # Only go read the file if we didn't get paramDefs as a keyword argument
+        paramDefs, paramFile = GetParams(*args, progName=progName, progPath=progPath, **kwargs)   # GetParams returns a dictionary and the file from which it was read.
         SetLogLevelsFromKwargs(myFunctionId, **kwargs)
-        paramDefs['paramFile'] = paramFile
-
-        ## If any of these options exist, include them in paramDefs so callers will get them too.
-        for a in BoilerPlateArgs:
-            paramName = a['paramName']
-            if (argVars[a.get('dest')] is not None):        # Use command line args if they exist
-                paramDefs[paramName] = argVars[a['dest']]   # overriding any params from params file.
-            debug(f"paramDefs['{paramName}'] is {paramDefs.get(f'{paramName}')}")
-
-        return paramDefs
-    finally:        # Restore logging levels to what they were when we began.
-        # setConsoleLoggingLevel(consoleLogLevel)
-        # setLogFileLoggingLevel(fileLogLevel)
-        pass
+        debug('Read parameter definitions from file "%s" and got\n%s', paramFile, paramDefs)
+    if (paramDefs is None) or (len(paramDefs) == 0):
+        critical(f"We have no parameter definitions; just quit now.")
+        return None, leftOverArgs
+
+    if os.path.isfile(paramFile):
+        paramDefs = LoadParamModule(paramFile, *args, **kwargs)     # validated once per file version
+    else:
+        paramDefs = ValidateParamDefs(paramDefs, *args, **kwargs)    # returns None if invalid
+    SetLogLevelsFromKwargs(myFunctionId, **kwargs)
+    debug('Validated paramDefs is %r\n', paramDefs)
+    if paramDefs is None:
+        critical(f"Parameter definitions are not valid; just quit now.")
+        return None, leftOverArgs
+
+    if processIndependent:
+        if paramDefs.get('Includes'):
+            raise ProcessDependentDefinitions("included parameter groups are loaded in the program's own process")
+        dependent = ProcessDependentExpressions(paramDefs)
+        if dependent:
+            raise ProcessDependentDefinitions(f"expressions depend on the process evaluating them: {dependent}")
+
+    ## Add the parameters of active included groups; the others are loaded when first looked up.
+    paramModules = None
+    unusedArgs = None
+    if (paramDefs is not None) and paramDefs.get('Includes'):
+        baseDir = os.path.dirname(os.path.realpath(paramFile)) if os.path.isfile(paramFile) else progPath
+        groups = kwargs.get('ParamGroups') if kwargs.get('ParamGroups') is not None else argVars.get('ParamGroups')
+        if isinstance(groups, str): groups = (groups,)
+        paramModules = ParamModules(paramDefs['Includes'], baseDir, groups)
+        paramDefs['Parameters'] = paramDefs['Parameters'] + paramModules.activeParameters(*args, **kwargs)
+        unusedArgs = list()     # may be options of groups not yet loaded; don't complain about them yet.
+
+    paramDefs = createParams(paramDefs, *args, argv=argv, environ=environ
+                                , progName=progName, progPath=progPath, leftOverArgs=unusedArgs, **kwargs)  #  CreateParams returns None if given None
+    SetLogLevelsFromKwargs(myFunctionId, **kwargs)
+    if paramModules is not None:
+        paramModules.bind(paramDefs, *args, argv=[argv[0], ] + unusedArgs, environ=environ
+                            , progName=progName, progPath=progPath, **kwargs)
+        paramDefs['ParamModules'] = paramModules
+        ## Options for groups not loaded yet are left for them; anything else is reported now.
+        unknown = paramModules.unknownOptions(unusedArgs)
+        if unknown:
+            logger.warning(f"These command line args match no option of the program or its parameter groups: {unknown!r}")
+    paramDefs['paramFile'] = paramFile
+    paramDefs['KeyWordRegistry'] = kwr
+
+    ## If any of these options exist, include them in paramDefs so callers will get them too.
+    for a in BoilerPlateArgs:
+        paramName = a['paramName']
+        if (argVars[a.get('dest')] is not None):        # Use command line args if they exist
+            paramDefs[paramName] = argVars[a['dest']]   # overriding any params from params file.
+        debug("paramDefs['%s'] is %s", paramName, paramDefs.get(paramName))
+
+    return paramDefs, leftOverArgs
 
 ##########################  ValidateParamDefs  ##############################
 def ValidateParamDefs(paramDefs=None, *args, **kwargs):
     consoleLogLevel = getConsoleLoggingLevel()
     fileLogLevel = getLogFileLoggingLevel()
-    debug(f"Saved log levels are console: {consoleLogLevel}, file: {fileLogLevel}")
+    debug("Saved log levels are console: %s, file: %s", consoleLogLevel, fileLogLevel)
 ########## Put this whole function in a try ... finally block so we can restore log levels on exit.
     try:
         myFunctionId = GetFunctionId()
         SetLogLevelsFromKwargs(myFunctionId, **kwargs)
-        logger.debug(f'In ValidateParamDefs, my "ID" is {myFunctionId}')
+        logger.debug('In ValidateParamDefs, my "ID" is %s', myFunctionId)
 
         if paramDefs is None:
             if kwargs.get('paramDefs')is not None:
@@ -628,7 +1018,7 @@ def ValidateParamDefs(paramDefs=None, *args, **kwargs):
             logger.debug('Parameter definitions dict is valid.')
         except SchemaError as e:
             logger.critical('Parameter definition dictionary is not valid.  %s', e)
-            logger.debug('%s' % e.autos)
+            debug('%s', e.autos)
             return None
         return ParamDefs
     finally:        # Restore logging levels to what they were when we began.
@@ -637,23 +1027,29 @@ def ValidateParamDefs(paramDefs=None, *args, **kwargs):
         pass
 
 ##########################  createParams  ##############################
-def createParams(paramDefs=None, *args, **kwargs):
+def createParams(paramDefs=None, *args, argv=None, environ=None, progName=None, progPath=None, leftOverArgs=None, **kwargs):
     '''Create a dictionary of parameters and values from a validated param definitions dictionary.
 
     Parameters:
         paramDefs       A validated parameter definitions dictionary, or None.
                         If None, and kwargs['paramDefs'] is not None, use that
                         as a validated parameter definition dictionary.
+        argv            optional: the command line to parse; defaults to sys.argv.
+        environ, progName, progPath
+                        optional: passed on to GetConfig.
+        leftOverArgs    optional: a list; if given, command line arguments not used
+                        are appended to it instead of being warned about.
     Calls GetConfig with kwargs argument to load a dictionary of configuration options.
     '''
+    if argv is None: argv = sys.argv
     consoleLogLevel = getConsoleLoggingLevel()
     fileLogLevel = getLogFileLoggingLevel()
-    debug(f"Saved log levels are console: {consoleLogLevel}, file: {fileLogLevel}")
+    debug("Saved log levels are console: %s, file: %s", consoleLogLevel, fileLogLevel)
 ########## Put this whole function in a try ... finally block so we can restore log levels on exit.
     try:
         myFunctionId = GetFunctionId()
         SetLogLevelsFromKwargs(myFunctionId, **kwargs)
-        logger.debug(f'In createParams, my "ID" is {myFunctionId}')
+        logger.debug('In createParams, my "ID" is %s', myFunctionId)
 
         if kwargs.get('loggingLevel') is not None:
             # setConsoleLoggingLevel(kwargs.get('loggingLevel'))
@@ -673,10 +1069,15 @@ def createParams(paramDefs=None, *args, **kwargs):
             progEpilog += f'{GetConfig.__doc__}'
         if kwargs.get("ProgramDocString") is not None:
             progEpilog += kwargs.get('ProgramDocString')
+        if paramDefs.get('Includes'):
+            progEpilog += "\nPARAMETER GROUPS (load with --ParamGroups):\n"
+            progEpilog += "".join(f"    {inc['group']}\t{inc['path']}\n" for inc in paramDefs['Includes'])
 
         #  Define some variables that will be in the local scope of the exec statements below (along with the created variables).
-        parser = argparse.ArgumentParser(
-            description = progDescription
+        parserClass = FastArgumentParser if paramDefs.get('ArgParser') == 'fast' else argparse.ArgumentParser
+        parser = parserClass(
+            prog = os.path.basename(argv[0])
+            , description = progDescription
             , usage='%(prog)s [options]'
             , formatter_class=argparse.RawDescriptionHelpFormatter
             , epilog = progEpilog
@@ -685,9 +1086,9 @@ def createParams(paramDefs=None, *args, **kwargs):
         if sys.version_info < (3,8):
             parser.register('action', 'extend', ExtendAction)
 
-        debug(f"Adding any PositionalArgParserArgs to parser.")
+        debug("Adding any PositionalArgParserArgs to parser.")
         if paramDefs.get('PositionalArgParserArgs') is not None:
-            debug(f"There is a PositionalArgParserArgs section of the parameters.")
+            debug("There is a PositionalArgParserArgs section of the parameters.")
             p = paramDefs.get('PositionalArgParserArgs')
             paramName = p.get('paramName')
             # Make sure paramName is first argument to add_argument.
@@ -697,13 +1098,16 @@ def createParams(paramDefs=None, *args, **kwargs):
                 if k in nonStringParserKeyWords: cmdArg.append(f"{k}={v}")
                 else:  cmdArg.append(f"{k}={v!r}")
             cmdArg = addArg.format(cmdArg=", ".join(cmdArg), paramName=paramName)
-            debug(f"Executing {cmdArg}")
+            debug("Executing %s", cmdArg)
             exec(cmdArg)
 
         createdParams = { 'parser': parser
-                , 'cfg': GetConfig(**kwargs)}   # configPaths passed as keyword arg if not default.
+                #  Every option stays visible: default and type expressions may read cfg.  Options are
+                #  only interpolated when looked up, so unused ones cost nothing.
+                , 'cfg': GetConfig(argv=argv, environ=environ, progName=progName, progPath=progPath
+                                    , **kwargs)}   # configPaths passed as keyword arg if not default.
         SetLogLevelsFromKwargs(myFunctionId, **kwargs)
-        debug(f'Initial created Params is {createdParams!r}')
+        debug('Initial created Params is %r', createdParams)
         ##  keep track of keys that we do not want to return to caller.
         localOnlyKeys = ['parser', 'cfg']
 
@@ -717,23 +1121,23 @@ def createParams(paramDefs=None, *args, **kwargs):
             if p.get('intermediate') is not None:
                 if p['intermediate']:
                     localOnlyKeys.append(paramName)
-                    debug(f"Intermediate param {paramName} will be removed from final dictionary.")
-            debug(f"\nInitial definition of parameter {paramName}, setting default value.")
+                    debug("Intermediate param %s will be removed from final dictionary.", paramName)
+            debug('\nInitial definition of parameter %s, setting default value.', paramName)
             if p.get('default') is not None:
                 if p.get('type') is not None:
                     arg = f'''{paramName} = {p['type']}({p['default']!r})'''
                 else:
                     arg = f'''{paramName} = {p['default']}'''
-                debug(f'exec({arg})')
+                debug('exec(%s)', arg)
                 exec(arg, globals(), createdParams)
             else:
                 createdParams[paramName] = None
-            debug(f"Created param {paramName} as {createdParams[paramName]}.")
+            debug("Created param %s as %s.", paramName, createdParams[paramName])
 
             ## Now that the parameter is created with its default value, see if we need a command line option for it.
             a = p.get('argParserArgs')
             if a is not None:
-                debug(f"Adding '{paramName}' to argparse")
+                debug("Adding '%s' to argparse", paramName)
                 #  schema validation does not guarantee at least one of these, so we do it here.
                 if (a.get('short') is None) and (a.get('long')  is None):
                     critical(f'One of argParserArgs options in "short" or "long" form must be present and not None: {p!r}')
@@ -751,6 +1155,12 @@ def createParams(paramDefs=None, *args, **kwargs):
 
                 if (a.get('help') is None) and (p.get('description') is not None):
                     a['help'] = f"{p['description']!r}"        # Default the help string from parameter description
+                #  argparse converts nargs/append/extend values one token at a time; a vector type then only
+                #  converts, and its length and range are checked on the whole vector after parsing.
+                if (a.get('type') is not None) and ('vectorType' not in a) and ((a.get('nargs') is not None) or (a.get('action') in ('append', 'extend'))) \
+                        and isinstance(eval(a['type'], globals()), VectorType):
+                    a['vectorType'] = a['type']
+                    a['type'] = f"({a['type']}).unchecked"
                 #  Add keyword arguments to the list of add_argument args
                 for (k, v) in a.items():                # add other keyword arguments to arg list.
                     if (k not in validArgParserKeyWords) or (v is None): continue
@@ -759,32 +1169,35 @@ def createParams(paramDefs=None, *args, **kwargs):
                 ## put together the whole add_argument call
                 cmdArg = ', '.join(cmdArg)
                 arg = addArg.format(cmdArg=cmdArg, a=a, paramName=paramName)
-                debug(f'exec({arg})')
+                debug('exec(%s)', arg)
                 try:
                     exec(arg, globals(), createdParams)
-                    logger.debug(f'Successfully added command line argument option for "{paramName}""')
+                    logger.debug('Successfully added command line argument option for "%s""', paramName)
                 except Exception as e:
                     logger.warning(f"Trying to add arg had an exception: {e}")
                     pass
 
         addBoilerPlateArgs(parser, **kwargs)
 
-        debug(f"Argument parser help is:\n\n{createdParams['parser'].format_help()}")
-        createdParams['args'], leftOverArgs = createdParams['parser'].parse_known_args()
+        if logger.isEnabledFor(logging.DEBUG):      # format_help renders every option; only pay for it when it will be shown.
+            debug('Argument parser help is:\n\n%s', createdParams['parser'].format_help())
+        createdParams['args'], unusedArgs = createdParams['parser'].parse_known_args(argv[1:])
         localOnlyKeys.append('args')
-        if len(leftOverArgs) > 0:
-            logger.warning(f"These command line args were ignored: {leftOverArgs!r}")
+        if leftOverArgs is not None:
+            leftOverArgs.extend(unusedArgs)
+        elif len(unusedArgs) > 0:
+            logger.warning(f"These command line args were ignored: {unusedArgs!r}")
         debug(createdParams['args'])
 
 
-        debug(f"CreatedParams before applying the config params and command line options: {createdParams!r}")
+        debug("CreatedParams before applying the config params and command line options: %r", createdParams)
         #### if there is no configuration option for the item, it won't be set from the config file; it will be left as its default.
 
-        debug(f"\n\nApplying values from config file, then from program arguments.")
+        debug('\n\nApplying values from config file, then from program arguments.')
         try:
             for p in paramDefs.get('Parameters'):
                 paramName = p['paramName']
-                debug(f"Looking for config & option for: {paramName} ({createdParams[paramName]})")
+                debug("Looking for config & option for: %s (%s)", paramName, createdParams[paramName])
                 a = p.get('argParserArgs')
                 # get the type of the parameter
                 t = p.get('type', '')
@@ -793,23 +1206,33 @@ def createParams(paramDefs=None, *args, **kwargs):
                     configName = p['configName']
                     cfgVal = createdParams['cfg'].get(configName)
                     if cfgVal is not None:
-                        debug(f"Config file setting {paramName} to {cfgVal!r}")
+                        debug("Config file setting %s to %r", paramName, cfgVal)
                         arg = f'''{paramName} = {t}({cfgVal!r})'''
-                        debug(f'exec({arg})')
+                        debug('exec(%s)', arg)
                         exec(arg, globals(), createdParams)
-                        debug(f"{paramName} is %s"%eval(f"{paramName}", globals(), createdParams))
-                    else: debug(f"Config file has no option for {configName}")
-                else: debug(f"There is no configName option for parameter {paramName}, don't look in config file.")
+                        debug("%s is %s", paramName, createdParams[paramName])
+                    else: debug("Config file has no option for %s", configName)
+                else: debug("There is no configName option for parameter %s, don't look in config file.", paramName)
                 # if the parameter is specified on the command line, it overrides the config file
                 if a is not None:
                     optDest = a['dest']
-                    debug(f"Trying for command line arg............ {optDest}")
+                    debug("Trying for command line arg............ %s", optDest)
                     ## Multi-line exec string must obey indenting rules too.
                     arg = setParamFromOption.format(optDest=optDest, paramName=paramName)
-                    debug(f'exec({arg})')
+                    debug('exec(%s)', arg)
                     exec(arg, globals(), createdParams)
-                    debug(f"{paramName} is %s"%eval(f"{paramName}", globals(), createdParams))
-                else: debug(f"No command line option defined for {paramName}")
+                    ## nargs/append/extend options give a list; vector types convert it in bulk.
+                    ## The option's own vector type (and its length and range checks) comes first.
+                    vt = a.get('vectorType') or t
+                    if vt and isinstance(createdParams[paramName], list):
+                        paramType = eval(vt, globals())
+                        if isinstance(paramType, VectorType):
+                            try:
+                                createdParams[paramName] = paramType(createdParams[paramName])
+                            except ValueError as e:
+                                createdParams['parser'].error(f"argument {a.get('long') or a.get('short')}: {e}")
+                    debug("%s is %s", paramName, createdParams[paramName])
+                else: debug("No command line option defined for %s", paramName)
         except UserWarning as w:
             logger.warning(w)
 
@@ -817,6 +1240,12 @@ def createParams(paramDefs=None, *args, **kwargs):
         for k in localOnlyKeys:
             if k in createdParams:
                 del createdParams[k]        # Removes key & value
+
+        ## Fingerprint the parameters that affect results; with none marked it covers nothing.
+        ## A marked parameter without a canonical form is an error.
+        fingerprintNames = [p['paramName'] for p in paramDefs.get('Parameters') if p.get('affectsResults')]
+        fingerprint = ParamFingerprint(createdParams, fingerprintNames)
+        createdParams['ParamsFingerprint'] = fingerprint
         # Return the final product.
         return createdParams
     finally:        # Restore logging levels to what they were when we began.
@@ -0,0 +1,149 @@
+
+'''
+Parameter types for long lists of numbers: thresholds, channel maps,
+coefficient tables, ...
+
+A VectorType converts, in bulk, a string of numbers separated by commas and/or
+whitespace (or "@<file name>" to read such a string from a file, or a list of
+such strings as argparse gives for nargs="+" options) into an array.array of
+the given typecode, or a NumPy array when useNumpy=True and NumPy is installed.
+That takes a fraction of the memory and time of a python list of boxed numbers.
+
+The length and the range of the values may be checked; a ValueError is raised
+if they are wrong (argparse reports it as an invalid option value).
+
+Use them as the "type" of a parameter or of its argParserArgs in the parameter
+definitions file:
+
+    type = "FloatVector"
+    type = "VectorType('d', length=16, min=0.0, max=1.0)"
+    type = "IntVector"
+
+For an option with nargs (or action "append" or "extend"), argparse converts
+each value separately; createParams then gives argparse the vector type's
+"unchecked" form and checks length and range once, on the whole vector.
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import array            #   https://docs.python.org/3/library/array.html
+import logging          #   https://docs.python.org/3/library/logging.html
+try:
+    import numpy        #   https://numpy.org       optional
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+debug = logger.debug
+
+#  array typecodes holding integers; everything else ('f', 'd') holds floats.
+_integerTypecodes = frozenset('bBhHiIlLqQ')
+
+class VectorType:
+    '''
+    Parameters:
+        typecode        optional: an array module typecode; default 'd' (float).
+        length          optional: the exact number of values required.
+        minLength       optional: the least number of values allowed.
+        maxLength       optional: the most number of values allowed.
+        min             optional: the least value allowed.
+        max             optional: the greatest value allowed.
+        useNumpy        optional: if True and NumPy is installed, return a numpy.ndarray.
+    '''
+    def __init__(self, typecode='d', length=None, minLength=None, maxLength=None
+                , min=None, max=None, useNumpy=False):
+        array.array(typecode)           # raises ValueError for a bad typecode
+        self.typecode = typecode
+        self.length = length
+        self.minLength = minLength
+        self.maxLength = maxLength
+        self.min = min
+        self.max = max
+        self.useNumpy = bool(useNumpy) and (numpy is not None)
+        if useNumpy and (numpy is None):
+            logger.info("NumPy is not installed; vectors will be array.array('%s').", typecode)
+        self._convert = int if typecode in _integerTypecodes else float
+
+    def _tokens(self, value):
+        '''Split value into number strings.'''
+        if isinstance(value, str):
+            if value.startswith('@'):
+                with open(os.path.expanduser(value[1:])) as f:
+                    value = f.read()
+            return value.replace(',', ' ').split()
+        #  A list of strings (nargs="+") or of numbers; strings may hold several numbers each.
+        tokens = list()
+        for v in value:
+            if isinstance(v, (int, float)): tokens.append(v)
+            elif isinstance(v, str): tokens.extend(self._tokens(v))
+            elif isinstance(v, (list, tuple, array.array)) or ((numpy is not None) and isinstance(v, numpy.ndarray)):
+                tokens.extend(v)
+            else: tokens.append(v)
+        return tokens
+
+    def __call__(self, value):
+        if value is None: return None
+        tokens = self._tokens(value)
+        try:
+            if self.useNumpy:
+                vector = numpy.array(tokens, dtype=numpy.dtype(self.typecode))
+            else:
+                vector = array.array(self.typecode, map(self._convert, tokens))
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"{self!r}: {e}") from e
+        self.check(vector)
+        return vector
+
+    def check(self, vector):
+        '''Raise ValueError if vector's length or values are out of bounds.'''
+        n = len(vector)
+        if (self.length is not None) and (n != self.length):
+            raise ValueError(f"{self!r}: {n} values given, {self.length} required.")
+        if (self.minLength is not None) and (n < self.minLength):
+            raise ValueError(f"{self!r}: {n} values given, at least {self.minLength} required.")
+        if (self.maxLength is not None) and (n > self.maxLength):
+            raise ValueError(f"{self!r}: {n} values given, at most {self.maxLength} allowed.")
+        if n == 0: return
+        if self.min is not None:
+            lo = vector.min() if self.useNumpy else min(vector)
+            if lo < self.min: raise ValueError(f"{self!r}: value {lo} is less than {self.min}.")
+        if self.max is not None:
+            hi = vector.max() if self.useNumpy else max(vector)
+            if hi > self.max: raise ValueError(f"{self!r}: value {hi} is greater than {self.max}.")
+
+    @property
+    def unchecked(self):
+        '''The same conversion without the length and range checks, for argparse to apply
+        to each value of an nargs/append/extend option; createParams checks the whole vector.'''
+        return _UncheckedVectorType(self.typecode)
+
+    def __repr__(self):
+        extras = "".join(f", {k}={getattr(self, k)!r}" for k in ('length', 'minLength', 'maxLength', 'min', 'max')
+                                                        if getattr(self, k) is not None)
+        if self.useNumpy: extras += ", useNumpy=True"
+        return f"VectorType({self.typecode!r}{extras})"
+
+    #  argparse names the type in its "invalid <type> value" error messages.
+    @property
+    def __name__(self):
+        return repr(self)
+
+class _UncheckedVectorType(VectorType):
+    '''
+    Converts one command line value to a number, or to a tuple of numbers if it holds
+    several ("1,2"), without building an array for each: createParams makes the vector
+    of them all at once.
+    '''
+    def __call__(self, value):
+        if value is None: return None
+        if isinstance(value, str) and not value.startswith('@'):
+            tokens = value.replace(',', ' ').split()
+        else:
+            tokens = self._tokens(value)
+        try:
+            if len(tokens) == 1: return self._convert(tokens[0])
+            return tuple(map(self._convert, tokens))
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"{self!r}: {e}") from e
+
+IntVector = VectorType('q')
+FloatVector = VectorType('d')
@@ -0,0 +1,72 @@
+'''
+FastArgumentParser must give the same results as argparse.ArgumentParser: the same
+namespace and left over arguments, or the same exit, usage and error message, for
+any command line.  Each positional argument variant is checked on every single token
+and on a seeded sample of random command lines, against the running Python's argparse.
+'''
+
+import io               #   https://docs.python.org/3/library/io.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import random           #   https://docs.python.org/3/library/random.html
+import argparse         #   https://docs.python.org/3/library/argparse.html
+import contextlib       #   https://docs.python.org/3/library/contextlib.html
+import pytest           #   https://docs.pytest.org
+from progparams.FastArgParse import FastArgumentParser
+
+def build(parserClass, positional=None):
+    '''A parser with an option of every action FastArgumentParser handles itself.'''
+    p = parserClass(prog='t.py', usage='%(prog)s [options]', description='desc', epilog='epi',
+                    formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument('-s', '--store', dest='store', help='a store')
+    p.add_argument('-i', '--int', dest='int', type=int, default='5')
+    p.add_argument('--choice', dest='choice', choices=['a', 'b'])
+    p.add_argument('--opt', dest='opt', nargs='?', const='C', default='D')
+    p.add_argument('--star', dest='star', nargs='*', type=float)
+    p.add_argument('--plus', dest='plus', nargs='+')
+    p.add_argument('--two', dest='two', nargs=2)
+    p.add_argument('-c', '--const', dest='const', action='store_const', const=42)
+    p.add_argument('-t', '--true', dest='true', action='store_true')
+    p.add_argument('-f', '--false', dest='false', action='store_false')
+    p.add_argument('-a', '--append', dest='append', action='append')
+    p.add_argument('--appendConst', dest='appendConst', action='append_const', const='X')
+    p.add_argument('-v', '--verbose', dest='verbose', action='count')
+    if sys.version_info >= (3, 8):          # argparse has "extend" from python 3.8
+        p.add_argument('-e', '--extend', dest='extend', action='extend', nargs='+')
+    p.add_argument('--req', dest='req', required=False)
+    p.add_argument('--shared1', dest='shared', default='first')
+    p.add_argument('--shared2', dest='shared', default='second')
+    if positional is not None: p.add_argument('pos', **positional)
+    return p
+
+def run(parser, argv):
+    '''(outcome, stdout, stderr) of parse_known_args(argv).'''
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            ns, extras = parser.parse_known_args(argv)
+            result = ('ok', vars(ns), extras)
+        except SystemExit as e:
+            result = ('exit', e.code)
+    return result, out.getvalue(), err.getvalue()
+
+tokens = ['-s', 'x', '--store=y', '-sz', '-i', '3', '--int=4', '-i', 'bad', '--choice', 'a', '--choice=c',
+          '--opt', '--opt=o', '--star', '1', '2.5', '--star', '--plus', 'p', 'q', '--plus', '--two', 'u', 'w',
+          '-c', '-t', '-f', '-tfc', '-a', 'A', '-aB', '--appendConst', '-v', '-vv', '-vvv', '-e', 'e1', 'e2',
+          '--', 'after', '-', 'pos1', 'pos2', '--unknown', '--unknown=3', '-u', '-5', '-1.5', 'has space',
+          '--stor', '--ver', '-tz', '--true=1', '--req', 'r', '--shared1', 's1', '-h', '--help', '-i-3']
+
+positionals = [None, {}, {'nargs': '?'}, {'nargs': '*'}, {'nargs': '+'}, {'nargs': 2}, {'nargs': '*', 'default': ['d']}]
+
+def commandLines(count=1000, seed=1):
+    rng = random.Random(seed)
+    return [[]] + [[t] for t in tokens] + [rng.sample(tokens, rng.randint(2, 7)) for _ in range(count)]
+
+@pytest.mark.parametrize('positional', positionals, ids=repr)
+def test_sameAsArgparse(positional):
+    fast, ref = build(FastArgumentParser, positional), build(argparse.ArgumentParser, positional)
+    differ = [(argv, a, b) for argv in commandLines() for (a, b) in [(run(fast, argv), run(ref, argv))] if a != b]
+    assert differ[:3] == [], f"{len(differ)} command lines differ"
+
+@pytest.mark.parametrize('positional', positionals, ids=repr)
+def test_formatHelp(positional):
+    assert build(FastArgumentParser, positional).format_help() == build(argparse.ArgumentParser, positional).format_help()
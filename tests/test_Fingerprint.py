@@ -0,0 +1,91 @@
+'''
+The canonical form behind ParamFingerprint: the same values give the same fingerprint
+in every run (whatever the string hash seed) and whatever order dicts and sets hold them
+in, and update() gives what a fingerprint made from scratch gives.
+'''
+
+import os               #   https://docs.python.org/3/library/os.html
+import sys              #   https://docs.python.org/3/library/sys.html
+import array            #   https://docs.python.org/3/library/array.html
+import enum             #   https://docs.python.org/3/library/enum.html
+import pathlib          #   https://docs.python.org/3/library/pathlib.html
+import datetime         #   https://docs.python.org/3/library/datetime.html
+import subprocess       #   https://docs.python.org/3/library/subprocess.html
+import pytest           #   https://docs.pytest.org
+from progparams.Fingerprint import ParamFingerprint, FingerprintParams
+
+class Colour(enum.Enum):
+    RED = 1
+    BLUE = 2
+
+def sampleParams():
+    return {'threshold': 0.25, 'count': 7, 'name': 'run', 'flag': True, 'nothing': None,
+            'table': {'b': [1, 2.5, 'x'], 'a': (3, None), 7: b'bytes'},
+            'tags': {'gamma', 'alpha', 'beta'}, 'frozen': frozenset({1, 2, 3}),
+            'vector': array.array('d', [1.0, 2.0, 3.0]), 'counts': array.array('q', [1, -2]),
+            'colour': Colour.BLUE, 'path': pathlib.PurePosixPath('/data/in.csv'),
+            'when': datetime.datetime(2024, 5, 6, 7, 8, 9), 'z': 1 + 2j}
+
+script = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import test_Fingerprint as t
+p = t.sampleParams()
+print(t.FingerprintParams(p, sorted(p)))
+'''
+
+def test_sameInEveryRun():
+    p = sampleParams()
+    here = FingerprintParams(p, sorted(p))
+    testsDir = os.path.dirname(os.path.realpath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(testsDir), os.environ.get('PYTHONPATH', '')]))
+    for seed in ('0', '1', '12345'):
+        env['PYTHONHASHSEED'] = seed
+        out = subprocess.run([sys.executable, '-c', script, testsDir], env=env, check=True,
+                             stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+        assert out == here, f"PYTHONHASHSEED={seed}"
+
+def test_orderOfDictsAndSets():
+    a = {'d': {'x': 1, 'y': [2, 3], 'z': {'p': None}}, 's': {3, 1, 2}, 'w': {'one', 'two', 'three'}}
+    b = {'w': {'three', 'two', 'one'}, 's': {2, 3, 1}, 'd': {'z': {'p': None}, 'y': [2, 3], 'x': 1}}
+    assert FingerprintParams(a, ['d', 's', 'w']) == FingerprintParams(b, ['w', 'd', 's'])
+    #  Lists and tuples keep their order.
+    assert FingerprintParams({'l': [1, 2]}, ['l']) != FingerprintParams({'l': [2, 1]}, ['l'])
+
+def test_distinguishesTypes():
+    forms = [1, 1.0, True, '1', b'1', [1], (1,), {1}, array.array('q', [1]), array.array('d', [1.0]), None]
+    digests = {FingerprintParams({'p': v}, ['p']) for v in forms}
+    assert len(digests) == len(forms) - 1          # a list and a tuple are the same sequence
+
+def test_updateSameAsRecompute():
+    p = sampleParams()
+    names = sorted(p)
+    fp = ParamFingerprint(p, names)
+    p['threshold'] = 0.5
+    p['table'] = {'a': (3, None)}
+    fp.update('threshold', p['threshold'])
+    fp.update('table', p['table'])
+    assert fp == ParamFingerprint(p, names)
+    assert fp.hexdigest() == FingerprintParams(p, names)
+    fp.remove('tags')
+    assert fp.hexdigest() == FingerprintParams(p, [n for n in names if n != 'tags'])
+    assert fp.names == frozenset(names) - {'tags'}
+
+def test_noNamesIsZero():
+    assert ParamFingerprint(sampleParams(), ()).hexdigest() == '0' * 64
+
+def test_noCanonicalForm():
+    with pytest.raises(TypeError):
+        ParamFingerprint({'p': object()}, ['p'])
+
+    class WithForm:
+        def __init__(self, v): self.v = v
+        def __fingerprint__(self): return {'v': self.v}
+    assert FingerprintParams({'p': WithForm(3)}, ['p']) == FingerprintParams({'p': WithForm(3)}, ['p'])
+    assert FingerprintParams({'p': WithForm(3)}, ['p']) != FingerprintParams({'p': WithForm(4)}, ['p'])
+
+def test_numpyObjectArray():
+    numpy = pytest.importorskip('numpy')
+    with pytest.raises(TypeError):
+        ParamFingerprint({'p': numpy.array([1, 'a'], dtype=object)}, ['p'])
+    assert FingerprintParams({'p': numpy.arange(4, dtype='>i4')}, ['p']) == FingerprintParams({'p': numpy.arange(4, dtype='<i4')}, ['p'])